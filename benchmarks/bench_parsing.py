@@ -0,0 +1,107 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Benchmark for reading the files of an Open edX course export: the original
+way of reading each file as text and parsing it with a new parser, against
+reading bytes and parsing them with the reused parsers in
+`doclint.util.parsing`.
+
+Usage: python benchmarks/bench_parsing.py COURSE_DIR [--repeat N]
+"""
+
+import argparse
+import time
+
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from doclint.structure.content import extract_lxml
+from doclint.util.parsing import parse_html_file, parse_xml_file
+
+
+def xml_as_text(file: Path):
+    with open(file, 'r', encoding='utf-8') as fd:
+        xml = fd.read()
+    return etree.fromstring(text = xml, parser = None)
+
+
+def xml_as_bytes(file: Path):
+    return parse_xml_file(file)
+
+
+def html_as_text(file: Path):
+    with open(file, 'r', encoding = 'utf-8') as fd:
+        return BeautifulSoup(fd, features='lxml')
+
+
+def html_as_bytes(file: Path):
+    return BeautifulSoup(file.read_bytes(), features='lxml', from_encoding='utf-8')
+
+
+def html_lxml(file: Path):
+    return extract_lxml(parse_html_file(file))
+
+
+def run(name: str, function, files: list[Path], repeat: int) -> float:
+    """
+    Apply `function` to all `files`, `repeat` times, and print the best time.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for file in files:
+            function(file)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<24} {len(files):>7} files {best:>9.3f}s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'benchmark file parsing')
+    parser.add_argument('docdir', type = Path)
+    parser.add_argument('--repeat', type = int, default = 5)
+    args = parser.parse_args()
+
+    xml_files = [
+        file for directory in ('chapter', 'sequential', 'vertical', 'html', 'video', 'problem')
+            for file in sorted(args.docdir.joinpath(directory).glob('*.xml'))
+    ]
+    html_files = sorted(args.docdir.joinpath('html').glob('*.html'))
+
+    before = run('xml, text', xml_as_text, xml_files, args.repeat)
+    after = run('xml, bytes', xml_as_bytes, xml_files, args.repeat)
+    print(f"{'':<24} speed-up {before / after:.2f}x")
+    before = run('html bs4, text', html_as_text, html_files, args.repeat)
+    after = run('html bs4, bytes', html_as_bytes, html_files, args.repeat)
+    print(f"{'':<24} speed-up {before / after:.2f}x")
+    after = run('html lxml, bytes', html_lxml, html_files, args.repeat)
+    print(f"{'':<24} speed-up {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,4 +24,354 @@
 
 """
 Importer for content that is part of a Material for MkDocs project.
-"""
\ No newline at end of file
+"""
+
+from __future__ import annotations
+
+import os
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+from urllib.parse import unquote, urlsplit
+
+import yaml
+
+from doclint.structure.content import Content, ReadOptions
+from doclint.structure.navigation import NavLevel, NavTree
+from doclint.util.cache import ParseCache
+
+# The element that Material for MkDocs renders the content of a page into.
+CONTENT_REGION = 'article'
+
+
+# =============================================================================
+# (Data-)Classes
+# =============================================================================
+
+@dataclass(kw_only=True)
+class Site(NavLevel):
+    """
+    A site built by MkDocs, the root of the navigation. Its children are the
+    top-level entries of the `nav` in `mkdocs.yml`.
+    """
+    site_dir: Path
+    items: list[NavLevel] = field(default_factory = list)
+
+    def is_root(self) -> bool:
+        return True
+
+    def has_children(self) -> bool:
+        return len(self.items) > 0
+
+    def children(self) -> Sequence[NavLevel]:
+        return self.items
+
+    def has_content(self) -> bool:
+        return False
+
+    def content(self) -> list[Content]:
+        return []
+
+    def pages(self) -> list[Page]:
+        """
+        Return all the pages of the site, in navigation order.
+        """
+        pages: list[Page] = []
+        stack: list[NavLevel] = list(reversed(self.items))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Page):
+                pages.append(node)
+            stack.extend(reversed(node.children()))
+        return pages
+
+
+@dataclass(kw_only=True)
+class Section(NavLevel):
+    """
+    A section of the navigation that groups pages and other sections.
+    """
+    items: list[NavLevel] = field(default_factory = list)
+
+    def is_root(self) -> bool:
+        return False
+
+    def has_children(self) -> bool:
+        return len(self.items) > 0
+
+    def children(self) -> Sequence[NavLevel]:
+        return self.items
+
+    def has_content(self) -> bool:
+        return False
+
+    def content(self) -> list[Content]:
+        return []
+
+
+@dataclass(kw_only=True)
+class Page(NavLevel):
+    """
+    A page of the site, built from the Markdown file `src` into the HTML file
+    `html`, whose content is read into `elements`.
+    """
+    src: str
+    html: Path
+    elements: list[Content] = field(default_factory = list)
+
+    def is_root(self) -> bool:
+        return False
+
+    def has_children(self) -> bool:
+        return False
+
+    def children(self) -> list[NavLevel]:
+        return []
+
+    def has_content(self) -> bool:
+        return len(self.elements) > 0
+
+    def content(self) -> list[Content]:
+        return self.elements
+
+    def read_content(self, options: ReadOptions = ReadOptions()) -> None:
+        """
+        Read the content of the page from the `article` of the built HTML
+        file. Pages that were not built have no content.
+        """
+        if self.html.exists():
+            site = self
+            while site.parent is not None:
+                site = site.parent
+            assets = SiteAssets(site.site_dir, self.html.parent)
+            self.elements = [
+                options.read_html(self.html, self, region = CONTENT_REGION, assets = assets)
+            ]
+
+
+@dataclass(frozen = True)
+class SiteAssets:
+    """
+    Resolves the `src` of images on a page to files in the built site: paths
+    starting with `/` against the `site_dir`, others against the directory
+    of the page.
+    """
+    site_dir: Path
+    page_dir: Path
+
+    def resolve(self, src: str | None) -> Path | None:
+        """
+        Return the file that `src` refers to, None if it is not part of the
+        site, including anything outside the `site_dir`, or does not exist.
+        """
+        if not src:
+            return None
+        try:
+            parts = urlsplit(src)
+        except ValueError:
+            return None
+        if parts.scheme or parts.netloc:
+            return None
+        path = unquote(parts.path)
+        base = self.site_dir if path.startswith('/') else self.page_dir
+        file = Path(os.path.normpath(base.joinpath(path.lstrip('/'))))
+        if not file.resolve().is_relative_to(self.site_dir.resolve()):
+            return None
+        return file if file.is_file() else None
+
+
+class ConfigLoader(yaml.SafeLoader): # pylint: disable=too-many-ancestors
+    """
+    A safe YAML loader for `mkdocs.yml` that reads the Python-specific tags
+    used there, such as `!!python/name:` or `!ENV`, as None instead of
+    failing on them. None of them are needed to read the navigation.
+    """
+
+ConfigLoader.add_multi_constructor('', lambda loader, suffix, node: None)
+
+
+# =============================================================================
+# Module functions
+# =============================================================================
+
+def load(
+    datadir: Path,
+    jobs: int = 1,
+    lazy: bool = False,
+    engine: str = 'bs4',
+    cache: ParseCache | None = None,
+    dedup: bool = False,
+    executor: Executor | None = None
+    ) -> Site:
+    """
+    Read the navigation of the MkDocs project in `datadir` from its
+    `mkdocs.yml` and then the content of each page from the built site. With
+    `jobs` greater than one, the pages are read by a pool of `jobs` threads.
+    The other arguments, including `executor`, are the same as for the
+    `openedx` datatype, as is the `NavTree` built at the end.
+    """
+    options = ReadOptions(
+        engine = engine,
+        lazy = lazy,
+        cache = cache,
+        shared = {} if dedup else None
+    )
+    site = read_site(datadir)
+    if executor is not None:
+        for _ in executor.map(lambda page: page.read_content(options), site.pages()):
+            pass
+    elif jobs <= 1:
+        for page in site.pages():
+            page.read_content(options)
+    else:
+        with ThreadPoolExecutor(max_workers = jobs) as executor:
+            for _ in executor.map(lambda page: page.read_content(options), site.pages()):
+                pass
+    NavTree(site)
+    return site
+
+
+def stream(
+    datadir: Path,
+    lazy: bool = False,
+    engine: str = 'bs4',
+    cache: ParseCache | None = None,
+    dedup: bool = False
+    ) -> Iterator[NavLevel]:
+    """
+    Streaming alternative to `load()` that yields the navigation nodes in
+    document order, each page with its content. Once a node has been yielded,
+    it is detached from its children, so pages that the consumer is done with
+    can be garbage collected.
+    """
+    options = ReadOptions(
+        engine = engine,
+        lazy = lazy,
+        cache = cache,
+        shared = {} if dedup else None
+    )
+    stack: list[NavLevel] = [read_site(datadir)]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Page):
+            node.read_content(options)
+        yield node
+        if isinstance(node, (Site, Section)):
+            stack.extend(reversed(node.items))
+            node.items = []
+
+
+def read_site(datadir: Path) -> Site:
+    """
+    Read `mkdocs.yml` in `datadir` and build the navigation tree from its
+    `nav`, or from the layout of the docs directory if there is none.
+    """
+    config = read_config(datadir)
+    docs_dir = datadir.joinpath(config.get('docs_dir') or 'docs')
+    site = Site(
+        name = config.get('site_name'),
+        parent = None,
+        site_dir = datadir.joinpath(config.get('site_dir') or 'site')
+    )
+    use_directory_urls = config.get('use_directory_urls', True)
+    nav = config.get('nav') or docs_nav(docs_dir)
+    site.items = read_nav(nav, site, site.site_dir, use_directory_urls)
+    return site
+
+
+def read_config(datadir: Path) -> dict[str, Any]:
+    """
+    Read the `mkdocs.yml` (or `mkdocs.yaml`) file of a project.
+    """
+    for name in ('mkdocs.yml', 'mkdocs.yaml'):
+        file = datadir.joinpath(name)
+        if file.exists():
+            with open(file, 'r', encoding = 'utf-8') as fd:
+                return yaml.load(fd, Loader = ConfigLoader) or {}
+    raise FileNotFoundError(f"no mkdocs.yml in {datadir}")
+
+
+def read_nav(
+    items: list,
+    parent: NavLevel,
+    site_dir: Path,
+    use_directory_urls: bool
+    ) -> list[NavLevel]:
+    """
+    Turn the entries of a `nav` from `mkdocs.yml` into navigation nodes. An
+    entry is either the path of a Markdown file, a single-key mapping from a
+    title to such a path or a mapping from a title to a list of entries for a
+    section. Links to external sites are left out.
+    """
+    nodes: list[NavLevel] = []
+    for item in items:
+        if isinstance(item, dict):
+            (title, value) = next(iter(item.items()))
+        else:
+            (title, value) = (None, item)
+
+        if isinstance(value, list):
+            section = Section(name = title, parent = parent)
+            section.items = read_nav(value, section, site_dir, use_directory_urls)
+            nodes.append(section)
+        elif isinstance(value, str) and '://' not in value:
+            nodes.append(Page(
+                name = title if title is not None else page_title(value),
+                parent = parent,
+                src = value,
+                html = site_dir.joinpath(html_path(value, use_directory_urls))
+            ))
+    return nodes
+
+
+def docs_nav(docs_dir: Path) -> list:
+    """
+    Build a `nav` from the Markdown files in the docs directory the way
+    MkDocs does when there is none in `mkdocs.yml`: files in alphabetical
+    order with index pages first, directories as sections after the files.
+    """
+    def nav(directory: Path) -> list:
+        entries = sorted(os.scandir(directory), key = lambda entry: entry.name)
+        files = [
+            Path(entry.path).relative_to(docs_dir).as_posix()
+                for entry in entries
+                if entry.is_file() and entry.name.endswith('.md')
+        ]
+        files.sort(key = lambda name: Path(name).stem not in ('index', 'README'))
+        sections = [
+            {page_title(entry.name): nav(Path(entry.path))}
+                for entry in entries
+                if entry.is_dir()
+        ]
+        return files + [section for section in sections if next(iter(section.values()))]
+
+    return nav(docs_dir) if docs_dir.is_dir() else []
+
+
+def html_path(src: str, use_directory_urls: bool = True) -> str:
+    """
+    Return the path of the HTML file MkDocs builds from the Markdown file
+    `src`, relative to the site directory.
+    """
+    path = Path(src)
+    stem = path.stem
+    if stem in ('index', 'README'):
+        return path.with_name('index.html').as_posix()
+    if use_directory_urls:
+        return path.with_suffix('').joinpath('index.html').as_posix()
+    return path.with_suffix('.html').as_posix()
+
+
+def page_title(src: str) -> str:
+    """
+    Return a title for a page or section that has none in the `nav`, derived
+    from its file or directory name as MkDocs does.
+    """
+    stem = Path(src).stem
+    if stem in ('index', 'README'):
+        parent = Path(src).parent.name
+        stem = parent if parent else 'Home'
+    title = stem.replace('-', ' ').replace('_', ' ')
+    return title[:1].upper() + title[1:]
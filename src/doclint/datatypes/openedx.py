@@ -29,21 +29,140 @@ from an Open edX installation.
 
 from __future__ import annotations
 
+import os
+import posixpath
+
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Sequence
-
-from bs4 import BeautifulSoup
-from lxml import etree
+from typing import Iterator, Sequence
+from urllib.parse import unquote, urlsplit
 
-from doclint.structure.content import DiscussionContent, HTMLContent, Content, ProblemContent, UnknownContent, VideoContent
-from doclint.structure.navigation import NavLevel
+from doclint.structure.content import DiscussionContent, HTMLContent, Content, ProblemContent, ReadOptions, UnknownContent, VideoContent
+from doclint.structure.navigation import NavLevel, NavTree
+from doclint.util.archive import ArchivePath, CourseArchive, is_archive
+from doclint.util.cache import ParseCache
+from doclint.util.parsing import parse_xml_file
 
 
 # =============================================================================
 # (Data-)Classes
 # =============================================================================
 
+@dataclass(frozen = True)
+class StaticAssets:
+    """
+    Resolves the `src` of images in the HTML content of a course to files in
+    its `static` directory. Studio refers to these as `/static/<name>`, older
+    exports as `/c4x/<org>/<course>/asset/<name>` and newer ones with asset
+    keys ending in `type@asset+block@<name>`.
+    """
+    static: Path
+
+    def resolve(self, src: str | None):
+        """
+        Return the file that `src` refers to, None if it is not a course
+        asset, does not exist or is outside the `static` directory.
+        """
+        if not src:
+            return None
+        try:
+            path = unquote(urlsplit(src).path)
+        except ValueError:
+            return None
+        if path.startswith(('/static/', 'static/')):
+            name = path.split('static/', 1)[1]
+        elif path.startswith('/c4x/') and '/asset/' in path:
+            name = path.split('/asset/', 1)[1]
+        elif 'type@asset+block@' in path:
+            name = path.split('type@asset+block@', 1)[1]
+        else:
+            return None
+        name = posixpath.normpath(name)
+        if name.startswith(('/', '../')) or name == '..':
+            return None
+        file = self.static.joinpath(name)
+        if isinstance(file, Path) and not file.resolve().is_relative_to(self.static.resolve()):
+            return None # a symbolic link out of the course
+        return file if file.exists() else None
+
+
+class CourseIndex:
+    """
+    An index of the `url_name` of everything in a course: the course itself,
+    its chapters, sequentials and verticals and the components in the
+    verticals. Each maps to the `url_name` of what is shown when following a
+    link to it, for components the vertical they are in. Resolves internal
+    links in the HTML content of the course, that is links to
+    `/jump_to_id/<url_name>` or `/courses/<course>/jump_to/<usage key>`,
+    without needing a running LMS. Only names are kept, no navigation nodes.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, str] = {}
+
+    def add(self, url_name: str, target: str) -> None:
+        """
+        Record that a link to `url_name` shows `target`.
+        """
+        self.nodes[url_name] = target
+
+    def add_course(self, course: Course) -> None:
+        """
+        Add the course and everything in its navigation structure.
+        """
+        self.add(course.url_name, course.url_name)
+        for chapter in course.chapters:
+            self.add(chapter.url_name, chapter.url_name)
+            for sequential in chapter.sequentials:
+                self.add(sequential.url_name, sequential.url_name)
+                for vertical in sequential.verticals:
+                    self.add_vertical(vertical)
+
+    def add_vertical(self, vertical: Vertical) -> None:
+        """
+        Add a vertical and the components in it.
+        """
+        self.add(vertical.url_name, vertical.url_name)
+        for (_, url_name) in vertical.components:
+            self.add(url_name, vertical.url_name)
+
+    def add_files(self, datadir: Path) -> None:
+        """
+        Add every block that has a file of its own, `<category>/<url_name>.xml`,
+        without reading any of the files. This is enough to tell whether a
+        link goes anywhere before the structure of the course has been read.
+        """
+        for url_name in block_names(datadir):
+            self.nodes.setdefault(url_name, url_name)
+
+    def is_internal(self, url: str) -> bool:
+        """
+        Returns True if `url` is a link to something in the course.
+        """
+        return jump_target(url) is not None
+
+    def resolve(self, url: str) -> str | None:
+        """
+        Return the `url_name` of what an internal link shows, None if there
+        is no such thing or `url` is not an internal link.
+        """
+        url_name = jump_target(url)
+        return self.nodes.get(url_name) if url_name is not None else None
+
+
+@dataclass
+class XmlNode:
+    """
+    An element read from an OLX file with its attributes. Only the root
+    element of a file and its direct children are read as that is all the
+    navigation structure needs. Unlike lxml elements, these can be cached.
+    """
+    tag: str
+    attrib: dict[str, str]
+    children: list[XmlNode]
+
+
 @dataclass
 class Course(NavLevel):
     """
@@ -52,6 +171,8 @@ class Course(NavLevel):
     url_name: str
     org: str
     chapters: Sequence[Chapter]
+    index: CourseIndex = field(default_factory = CourseIndex, repr = False, compare = False)
+    archive: CourseArchive | None = field(default = None, repr = False, compare = False)
 
     def is_root(self) -> bool:
         return True
@@ -68,45 +189,109 @@ class Course(NavLevel):
     def content(self) -> list[Content]:
         return []
 
+    def close(self) -> None:
+        """
+        Close the archive that the course was read from, if any.
+        """
+        if self.archive is not None:
+            self.archive.close()
+
 
     @staticmethod # not sure if we need to switch this to classmethod?
-    def read(datadir) -> Course:
+    def read(datadir, *, with_content: bool = True, options: ReadOptions = ReadOptions()) -> Course:
+        """
+        Read course data including the chapters contained. If `with_content`
+        is False, only the navigation structure is read and the content of
+        each `Vertical` is left for `read_contents()` to fill in. The `index`
+        of the course is filled in once its structure has been read.
+        """
+        course = Course.read_node(datadir, options)
+        course.chapters = course.read_chapters(
+            datadir,
+            with_content = with_content,
+            options = options
+        )
+        course.index.add_course(course)
+        return course
+
+    @staticmethod
+    def read_node(datadir: Path, options: ReadOptions = ReadOptions()) -> Course:
         """
-        Read course data including the chapters contained.
+        Read the course metadata from course.xml, without any chapters.
         """
-        root = parse_xml(datadir.joinpath("course.xml"))
+        root = parse_xml(datadir.joinpath("course.xml"), options.cache)
         assert root.tag == "course"
 
-        course = Course(
+        return Course(
             name = root.attrib['course'],
             parent = None,
             chapters = [],
             url_name = root.attrib['url_name'],
             org = root.attrib['org'],
         )
-        course.chapters = course.read_chapters(datadir)
-        return course
 
+    @staticmethod
+    def stream(datadir: Path, *, options: ReadOptions = ReadOptions()) -> Iterator[NavLevel]:
+        """
+        Yield the course and everything below it in document order. Nodes are
+        not added to their parent's children, so each subtree can be garbage
+        collected once the consumer is done with it.
+
+        The `index` is filled in from the names of the files in the course
+        beforehand, so that internal links can be resolved even if they point
+        further ahead in the course, and completed as verticals are read.
+        """
+        course = Course.read_node(datadir, options)
+        course.index.add_files(datadir)
+        yield course
+        for chap_url_name in course.chapter_url_names(datadir, options):
+            yield from Chapter.stream(datadir, chap_url_name, course, options = options)
+
+    def read_chapters(
+        self,
+        datadir: Path,
+        *,
+        with_content: bool = True,
+        options: ReadOptions = ReadOptions()
+        ) -> list[Chapter]:
+        """
+        Read the chapters contained in a course.
+        """
+        return [
+            Chapter.read(
+                datadir = datadir,
+                url_name = chap_url_name,
+                parent = self,
+                with_content = with_content,
+                options = options
+            )
+            for chap_url_name in self.chapter_url_names(datadir, options)
+        ]
 
-    def read_chapters(self, datadir: Path) -> list[Chapter]:
+    def chapter_url_names(self, datadir: Path, options: ReadOptions = ReadOptions()) -> list[str]:
         """
-        Read the XML file that lists the chapters contained in a course.
+        Read the XML file that lists the chapters contained in a course and
+        return their `url_name`s.
         """
-        chapters: list[Chapter] = []
-        root = parse_xml(datadir.joinpath(f'course/{self.url_name}.xml'))
+        root = parse_xml(datadir.joinpath(f'course/{self.url_name}.xml'), options.cache)
         assert root.tag == 'course'
 
-        for child in root.getchildren():
-            if child.tag == 'chapter':
-                chap_url_name = child.attrib['url_name']
-                chapter = Chapter.read(
-                    datadir = datadir,
-                    url_name = chap_url_name,
-                    parent = self
-                )
-                chapters.append(chapter)
+        return [
+            child.attrib['url_name']
+                for child in root.children
+                if child.tag == 'chapter'
+        ]
 
-        return chapters
+    def verticals(self) -> list[Vertical]:
+        """
+        Return all the verticals in the course, in document order.
+        """
+        return [
+            vertical
+                for chapter in self.chapters
+                for sequential in chapter.sequentials
+                for vertical in sequential.verticals
+        ]
 
 
 @dataclass(kw_only=True)
@@ -115,6 +300,7 @@ class Chapter(NavLevel):
     Chapter of a course, contains a number of Sequentials.
     """
     sequentials: list[Sequential]
+    url_name: str = ''
 
     def is_root(self) -> bool:
         return False
@@ -132,24 +318,66 @@ class Chapter(NavLevel):
         return []
 
     @staticmethod
-    def read(datadir: Path, url_name: str, parent: Course) -> Chapter:
+    def read(
+        datadir: Path,
+        url_name: str,
+        parent: Course,
+        *,
+        with_content: bool = True,
+        options: ReadOptions = ReadOptions()
+        ) -> Chapter:
         """
         Read the chapter definition for a chapter given by the `url_name`
         argument.
         """
-        root = parse_xml(datadir.joinpath(f'chapter/{url_name}.xml'))
+        (chapter, seq_url_names) = Chapter.read_node(datadir, url_name, parent, options)
+        chapter.sequentials = [
+            Sequential.read(
+                datadir,
+                seq_url_name,
+                chapter,
+                with_content = with_content,
+                options = options
+            )
+                for seq_url_name in seq_url_names
+        ]
+        return chapter
 
+    @staticmethod
+    def read_node(
+        datadir: Path,
+        url_name: str,
+        parent: Course,
+        options: ReadOptions = ReadOptions()
+        ) -> tuple[Chapter, list[str]]:
+        """
+        Read a chapter without its sequentials. Returns the chapter and the
+        `url_name`s of the sequentials it contains.
+        """
+        root = parse_xml(datadir.joinpath(f'chapter/{url_name}.xml'), options.cache)
         chapter = Chapter(
             name = root.attrib['display_name'],
             sequentials = [],
+            url_name = url_name,
             parent = parent
         )
+        return (chapter, [sequential.attrib['url_name'] for sequential in root.children])
 
-        chapter.sequentials = [
-            Sequential.read(datadir, sequential.attrib['url_name'], chapter)
-                for sequential in root.getchildren()
-        ]
-        return chapter
+    @staticmethod
+    def stream(
+        datadir: Path,
+        url_name: str,
+        parent: Course,
+        *,
+        options: ReadOptions = ReadOptions()
+        ) -> Iterator[NavLevel]:
+        """
+        Yield the chapter and everything below it in document order.
+        """
+        (chapter, seq_url_names) = Chapter.read_node(datadir, url_name, parent, options)
+        yield chapter
+        for seq_url_name in seq_url_names:
+            yield from Sequential.stream(datadir, seq_url_name, chapter, options = options)
 
 
 @dataclass
@@ -159,6 +387,7 @@ class Sequential(NavLevel):
     horizontally in Open edX.
     """
     verticals: list[Vertical]
+    url_name: str = ''
 
     def is_root(self) -> bool:
         return False
@@ -176,23 +405,80 @@ class Sequential(NavLevel):
         return []
 
     @staticmethod
-    def read(datadir: Path, url_name: str, parent: Chapter) -> Sequential:
+    def read(
+        datadir: Path,
+        url_name: str,
+        parent: Chapter,
+        *,
+        with_content: bool = True,
+        options: ReadOptions = ReadOptions()
+        ) -> Sequential:
         """
         Read a Sequential from disk.
         """
-        root = parse_xml(datadir.joinpath(f'sequential/{url_name}.xml'))
+        (sequential, vert_url_names) = Sequential.read_node(datadir, url_name, parent, options)
+        sequential.verticals = [
+            Vertical.read(
+                datadir,
+                vert_url_name,
+                sequential,
+                with_content = with_content,
+                options = options
+            )
+                for vert_url_name in vert_url_names
+        ]
+
+        return sequential
+
+    @staticmethod
+    def read_node(
+        datadir: Path,
+        url_name: str,
+        parent: Chapter,
+        options: ReadOptions = ReadOptions()
+        ) -> tuple[Sequential, list[str]]:
+        """
+        Read a Sequential without its verticals. Returns the sequential and the
+        `url_name`s of the verticals it contains.
+        """
+        root = parse_xml(datadir.joinpath(f'sequential/{url_name}.xml'), options.cache)
         sequential = Sequential(
             name=root.attrib['display_name'],
             verticals=[],
+            url_name = url_name,
             parent = parent
         )
+        return (sequential, [vertical.attrib['url_name'] for vertical in root.children])
 
-        sequential.verticals = [
-            Vertical.read(datadir, vertical.attrib['url_name'], sequential)
-                for vertical in root.getchildren()
-        ]
-
-        return sequential
+    @staticmethod
+    def stream(
+        datadir: Path,
+        url_name: str,
+        parent: Chapter,
+        *,
+        options: ReadOptions = ReadOptions()
+        ) -> Iterator[NavLevel]:
+        """
+        Yield the sequential and then its verticals, with their content.
+        """
+        (sequential, vert_url_names) = Sequential.read_node(datadir, url_name, parent, options)
+        yield sequential
+        for vert_url_name in vert_url_names:
+            vertical = Vertical.read(
+                datadir,
+                vert_url_name,
+                sequential,
+                with_content = False,
+                options = options
+            )
+            index = course_index(vertical)
+            if index is not None:
+                index.add_vertical(vertical)
+            vertical.elements = [
+                Vertical.read_content(datadir, comp_url_name, tagname, vertical, options = options)
+                    for (tagname, comp_url_name) in vertical.components
+            ]
+            yield vertical
 
 
 @dataclass
@@ -201,6 +487,8 @@ class Vertical(NavLevel):
     A unit, video, etc.
     """
     elements: list[Content] = field(default_factory = list)
+    components: list[tuple[str, str]] = field(default_factory = list) # (tag, url_name)
+    url_name: str = ''
 
     def is_root(self) -> bool:
         return False
@@ -218,26 +506,36 @@ class Vertical(NavLevel):
         return self.elements
 
     @staticmethod
-    def read(datadir: Path, url_name: str, parent: Sequential) -> Vertical:
+    def read(
+        datadir: Path,
+        url_name: str,
+        parent: Sequential,
+        *,
+        with_content: bool = True,
+        options: ReadOptions = ReadOptions()
+        ) -> Vertical:
         """
-        Read a vertical from disk.
+        Read a vertical from disk. The references to the components it
+        contains are always recorded, the components themselves are only read
+        if `with_content` is True.
         """
-        root = parse_xml(datadir.joinpath(f'vertical/{url_name}.xml'))
+        root = parse_xml(datadir.joinpath(f'vertical/{url_name}.xml'), options.cache)
         vertical = Vertical(
             name = root.attrib['display_name'],
             elements = [],
+            components = [
+                (element.tag, element.attrib['url_name'])
+                    for element in root.children
+            ],
+            url_name = url_name,
             parent = parent
         )
 
-        vertical.elements = [
-            Vertical.read_content(
-                datadir,
-                element.attrib['url_name'],
-                element.tag,
-                vertical
-            )
-            for element in root.getchildren()
-        ]
+        if with_content:
+            vertical.elements = [
+                Vertical.read_content(datadir, url_name, tagname, vertical, options = options)
+                    for (tagname, url_name) in vertical.components
+            ]
 
         return vertical
 
@@ -246,18 +544,22 @@ class Vertical(NavLevel):
         datadir: Path,
         url_name: str,
         tagname: str,
-        parent: Vertical
+        parent: Vertical,
+        *,
+        options: ReadOptions = ReadOptions()
         ) -> HTMLContent | DiscussionContent | VideoContent | ProblemContent | UnknownContent:
         """
         Depending on the specific type of element that is to be read,
-        dispatches to a method to read that specific element type.
+        dispatches to a method to read that specific element type. The
+        `options` control how HTML content is parsed.
         """
         match tagname:
             case 'html':
                 return Vertical.read_html(
                     datadir = datadir, 
                     url_name = url_name, 
-                    parent = parent
+                    parent = parent,
+                    options = options
                 )
             case 'discussion':
                 return DiscussionContent(parent = parent)
@@ -265,13 +567,15 @@ class Vertical(NavLevel):
                 return Vertical.read_video(
                     datadir = datadir,
                     url_name = url_name,
-                    parent = parent
+                    parent = parent,
+                    options = options
                 )
             case 'problem':
                 return Vertical.read_problems(
                     datadir = datadir,
                     url_name = url_name,
-                    parent = parent
+                    parent = parent,
+                    options = options
                 )
             case 'openassessment':
                 return UnknownContent(parent = parent)  # TODO
@@ -279,22 +583,35 @@ class Vertical(NavLevel):
                 return UnknownContent(parent = parent)
 
     @staticmethod
-    def read_html(datadir: Path, url_name: str, parent: Vertical) -> HTMLContent:
+    def read_html(
+        datadir: Path,
+        url_name: str,
+        parent: Vertical,
+        *,
+        options: ReadOptions = ReadOptions()
+        ) -> HTMLContent:
         """
-        Read HTML content
+        Read HTML content, parsed as given by the `options`. If they are lazy,
+        the HTML file is only parsed when the content is first used and the
+        parsed tree is dropped again after each use.
         """
-        root = parse_xml(datadir.joinpath(f'html/{url_name}.xml'))
+        root = parse_xml(datadir.joinpath(f'html/{url_name}.xml'), options.cache)
         htmlfile = datadir.joinpath(f'html/{url_name}.html')
-        with open(htmlfile, 'r', encoding = 'utf-8') as fd:
-            soup = BeautifulSoup(fd, features='lxml')
-            return HTMLContent(content = soup, parent = parent)
+        assets = StaticAssets(datadir.joinpath('static'))
+        return options.read_html(htmlfile, parent, assets = assets, targets = course_index(parent))
 
     @staticmethod
-    def read_video(datadir: Path, url_name: str, parent: Vertical) -> VideoContent:
+    def read_video(
+        datadir: Path,
+        url_name: str,
+        parent: Vertical,
+        *,
+        options: ReadOptions = ReadOptions()
+        ) -> VideoContent:
         """
         Read a video content (metadata).
         """
-        root = parse_xml(datadir.joinpath(f"video/{url_name}.xml"))
+        root = parse_xml(datadir.joinpath(f"video/{url_name}.xml"), options.cache)
 
         _local = not ('youtube' in root.attrib)
         _display_name = root.attrib['display_name']
@@ -316,17 +633,23 @@ class Vertical(NavLevel):
     def get_video_transcripts(root):
         t = type(root)
         return [child 
-                for child in root.getchildren() 
+                for child in root.children
                 if child.tag == 'transcript'
         ]
 
     @staticmethod
-    def read_problems(datadir: Path, url_name: str, parent: Vertical) -> ProblemContent:
+    def read_problems(
+        datadir: Path,
+        url_name: str,
+        parent: Vertical,
+        *,
+        options: ReadOptions = ReadOptions()
+        ) -> ProblemContent:
         """
         Read a ProblemUnit, comprising its metadata and ProblemContent
         contained within it.   
         """
-        root = parse_xml(datadir.joinpath(f'problem/{url_name}.xml'))
+        root = parse_xml(datadir.joinpath(f'problem/{url_name}.xml'), options.cache)
         
         return ProblemContent(
             name = "TODO",
@@ -343,19 +666,251 @@ class Vertical(NavLevel):
 # Module functions
 # =============================================================================
 
-def load(datadir: Path) -> Course:
+def load(
+    datadir: Path,
+    jobs: int = 1,
+    lazy: bool = False,
+    engine: str = 'bs4',
+    cache: ParseCache | None = None,
+    dedup: bool = False,
+    executor: Executor | None = None
+    ) -> Course:
     """
     Uses the static `read()` method in `Course` to read the course.xml file
     and from there anything else that is necessary to collect all course data.
+    The `datadir` can be a directory or an exported course archive.
+
+    The navigation structure is read first and the content of the verticals
+    after that. With `jobs` greater than one, the content is read by a pool of
+    `jobs` threads. The resulting `Course` is the same as the one read
+    serially. With `lazy` set, HTML content is only parsed when used. The
+    `engine` selects the HTML parser, see `HTML_ENGINES`. If a `cache` is
+    given, data extracted from files that have not changed since they were
+    cached is taken from there instead of parsing the files again. With
+    `dedup` set, byte-identical HTML files are only parsed once and share
+    what is extracted from them. An `executor` can be passed in to read the
+    content with instead of a pool of `jobs` threads, so that one pool can be
+    shared when loading many courses. Once everything has been read, a
+    `NavTree` is built so that the depth and path of each node are looked up
+    rather than computed.
+
+    A course read from an archive keeps the archive open, as lazy content is
+    read from it when used. Call `close()` on the course when done with it.
+    """
+    datadir = course_root(datadir)
+    archive = datadir.archive if isinstance(datadir, ArchivePath) else None
+    options = ReadOptions(
+        engine = engine,
+        lazy = lazy,
+        cache = cache,
+        shared = {} if dedup else None
+    )
+    try:
+        course = Course.read(datadir, with_content = False, options = options)
+        if executor is not None:
+            read_contents(course, datadir, executor, options = options)
+        elif jobs <= 1:
+            read_contents(course, datadir, options = options)
+        else:
+            with ThreadPoolExecutor(max_workers = jobs) as executor:
+                read_contents(course, datadir, executor, options = options)
+    except BaseException:
+        if archive is not None:
+            archive.close()
+        raise
+    course.archive = archive
+    NavTree(course)
+    return course
+
+
+def stream(
+    datadir: Path,
+    lazy: bool = False,
+    engine: str = 'bs4',
+    cache: ParseCache | None = None,
+    dedup: bool = False
+    ) -> Iterator[NavLevel]:
+    """
+    Streaming alternative to `load()` that yields the navigation nodes of the
+    course in document order, each `Vertical` with its content. Every node
+    has its `parent` set but nodes are not added to their parent's children,
+    so memory use is bounded by the depth of the tree rather than its size.
+    An archive that the course is read from is closed once the nodes have
+    all been yielded or the generator is closed.
+    """
+    datadir = course_root(datadir)
+    options = ReadOptions(
+        engine = engine,
+        lazy = lazy,
+        cache = cache,
+        shared = {} if dedup else None
+    )
+    try:
+        yield from Course.stream(datadir, options = options)
+    finally:
+        if isinstance(datadir, ArchivePath):
+            datadir.archive.close()
+
+
+def jump_target(url: str) -> str | None:
+    """
+    Return the `url_name` that an internal link goes to, None if `url` is
+    not an internal link. Links to another site are never internal. Usage
+    keys can be `block-v1:<course>+type@<type>+block@<url_name>` or the
+    older `i4x://<org>/<course>/<type>/<url_name>`.
     """
-    return Course.read(datadir)
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if parts.scheme or parts.netloc:
+        return None
+    path = unquote(parts.path).rstrip('/')
+    if '/jump_to_id/' in path:
+        return path.split('/jump_to_id/', 1)[1] or None
+    if '/jump_to/' in path:
+        key = path.split('/jump_to/', 1)[1]
+        if '+block@' in key:
+            return key.rsplit('+block@', 1)[1] or None
+        return key.rsplit('/', 1)[-1] or None
+    return None
+
+
+def block_names(datadir: Path) -> list[str]:
+    """
+    Return the `url_name`s of the blocks in a course that have a file of their
+    own, from the names of the XML files in its directories other than
+    `static` and `policies`.
+    """
+    skipped = ('static', 'policies')
+    if isinstance(datadir, ArchivePath):
+        prefix = datadir.name_in_archive + '/' if datadir.name_in_archive not in ('', '.') else ''
+        names = [
+            name[len(prefix):] for name in datadir.archive.members
+                if name.startswith(prefix)
+        ]
+        return [
+            posixpath.splitext(posixpath.basename(name))[0] for name in names
+                if name.count('/') == 1 and name.endswith('.xml')
+                and name.split('/', 1)[0] not in skipped
+        ]
+    found = []
+    with os.scandir(datadir) as directories:
+        for directory in directories:
+            if directory.name in skipped or not directory.is_dir():
+                continue
+            with os.scandir(directory.path) as entries:
+                found += [
+                    entry.name[:-len('.xml')] for entry in entries
+                        if entry.name.endswith('.xml')
+                ]
+    return found
+
+
+def course_index(node: NavLevel) -> CourseIndex | None:
+    """
+    Return the index of the course that `node` belongs to, None if it is not
+    part of a `Course`.
+    """
+    while node.parent is not None:
+        node = node.parent
+    return node.index if isinstance(node, Course) else None
 
 
-def parse_xml(file: Path):
+def course_root(datadir: Path):
+    """
+    Return the directory to read a course from. If `datadir` is an exported
+    course archive such as `course.tar.gz`, this is the directory inside the
+    archive that contains `course.xml`, read without extracting the archive.
     """
-    Parse the xml from a file
+    if is_archive(datadir):
+        return CourseArchive(datadir).root('course.xml')
+    return datadir
+
+
+def read_contents(
+    course: Course,
+    datadir: Path,
+    executor: Executor | None = None,
+    *,
+    options: ReadOptions = ReadOptions()
+    ):
     """
-    with open(file, 'r', encoding='utf-8') as fd:
-        xml = fd.read()
+    Read the content of all verticals in a course that was read without it,
+    using the `executor` given or serially if there is none.
 
-    return etree.fromstring(text = xml, parser = None)
\ No newline at end of file
+    The components are read in the order their files are stored in, rather
+    than in document order, to cut down on seeks when the files are not in
+    the operating system's cache. Each vertical's `elements` still end up in
+    the same order as its `components`.
+    """
+    tasks = [
+        (vertical, position, tagname, url_name)
+            for vertical in course.verticals()
+            for (position, (tagname, url_name)) in enumerate(vertical.components)
+    ]
+    order = StorageOrder(datadir)
+    tasks.sort(key = lambda task: order.key(task[2], f'{task[3]}.xml'))
+
+    def read(task):
+        (vertical, _, tagname, url_name) = task
+        return Vertical.read_content(datadir, url_name, tagname, vertical, options = options)
+
+    results = executor.map(read, tasks) if executor is not None else map(read, tasks)
+    for vertical in course.verticals():
+        vertical.elements = [None] * len(vertical.components)
+    for ((vertical, position, _, _), content) in zip(tasks, results):
+        vertical.elements[position] = content
+
+
+class StorageOrder:
+    """
+    Sort keys that put files in the order they are stored in: by directory
+    and then by inode number for files on disk, by offset for files in an
+    archive. Inode numbers are listed once per directory with `os.scandir()`,
+    which does not need to stat each file.
+    """
+
+    def __init__(self, datadir: Path) -> None:
+        self.datadir = datadir
+        self.inodes: dict[str, dict[str, int]] = {}
+
+    def key(self, directory: str, filename: str) -> tuple[str, int]:
+        """
+        Return the sort key for the file `filename` in `directory`.
+        """
+        if isinstance(self.datadir, ArchivePath):
+            return ('', self.datadir.joinpath(directory, filename).position())
+        if directory not in self.inodes:
+            try:
+                with os.scandir(self.datadir.joinpath(directory)) as entries:
+                    self.inodes[directory] = {entry.name: entry.inode() for entry in entries}
+            except OSError:
+                self.inodes[directory] = {}
+        return (directory, self.inodes[directory].get(filename, 0))
+
+
+def parse_xml(file: Path, cache: ParseCache | None = None) -> XmlNode:
+    """
+    Parse the xml from a file and return its root element with the direct
+    children. If a `cache` is given, it is used for files that have not
+    changed since they were last parsed.
+    """
+    if cache is not None:
+        node = cache.get(file, 'xml')
+        if node is not None:
+            return node
+
+    root = parse_xml_file(file)
+    node = XmlNode(
+        tag = root.tag,
+        attrib = dict(root.attrib),
+        children = [
+            XmlNode(tag = child.tag, attrib = dict(child.attrib), children = [])
+                for child in root
+                if isinstance(child.tag, str) # skip comments
+        ]
+    )
+    if cache is not None:
+        cache.put(file, 'xml', node)
+    return node
\ No newline at end of file
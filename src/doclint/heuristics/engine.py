@@ -0,0 +1,333 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+An engine that applies all heuristics to a navigation structure in a single
+pass. The heuristics are indexed by the types they declare through
+`applies_to_types()` once, so that each navigation node and each item in its
+content is only offered to the heuristics that apply to it.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import inspect
+import multiprocessing
+
+from typing import Any, Iterable, Iterator, NamedTuple, Sequence
+
+from ..structure.content import Content, Image, Link, Text
+from ..structure.findings import Findings, item_location
+from ..structure.navigation import NavLevel, contents, walk
+from ..util import extensions
+from .heuristic import Heuristic, get_heuristics
+
+# The methods of `Content` that return the items of each type. Heuristics for
+# a new type of item only need an entry here to be run by the engine.
+ITEM_SOURCES: dict[type, str] = {
+    Link: 'links',
+    Image: 'images',
+    Text: 'text',
+}
+
+
+# The number of work units to aim for per process in a parallel run, so that
+# subtrees of different sizes still keep all processes busy.
+UNITS_PER_JOB = 4
+
+# The engine and the work units of the parallel run in progress. These are
+# set before the worker processes are forked, so that the workers inherit
+# the navigation tree instead of it being pickled for them.
+parallel_run: tuple[Engine, list[tuple[NavLevel, bool]]] | None = None
+
+
+class Check(NamedTuple):
+    """
+    The result of applying one heuristic to one item, which is either a
+    navigation node or an item in the content of the `node`.
+    """
+    node: NavLevel
+    item: Any
+    heuristic: type[Heuristic]
+    passed: bool
+
+
+class HeuristicIndex:
+    """
+    Maps types to the heuristics that apply to them. A heuristic that applies
+    to a type also applies to its subclasses, so the heuristics for a type
+    are collected along its method resolution order the first time it is
+    looked up.
+    """
+
+    def __init__(self, heuristics: Iterable[type[Heuristic]]) -> None:
+        self.heuristics = list(heuristics)
+        self.declared: dict[type, list[type[Heuristic]]] = {}
+        for heuristic in self.heuristics:
+            for cls in heuristic.applies_to_types():
+                self.declared.setdefault(cls, []).append(heuristic)
+        self.resolved: dict[type, list[type[Heuristic]]] = {}
+
+    def for_type(self, cls: type) -> list[type[Heuristic]]:
+        """
+        Return the heuristics that apply to instances of `cls`.
+        """
+        found = self.resolved.get(cls)
+        if found is None:
+            found = []
+            for base in cls.__mro__:
+                for heuristic in self.declared.get(base, []):
+                    if heuristic not in found:
+                        found.append(heuristic)
+            self.resolved[cls] = found
+        return found
+
+    def item_types(self) -> list[type]:
+        """
+        Return the types of content items that at least one heuristic applies
+        to, in the order of `ITEM_SOURCES`.
+        """
+        return [cls for cls in ITEM_SOURCES if self.for_type(cls)]
+
+
+class Engine:
+    """
+    Runs heuristics over a navigation structure, walking it once. By default
+    all heuristics in the `doclint.heuristics` package are used, except the
+    optional ones.
+    """
+
+    def __init__(self, heuristics: Iterable[type[Heuristic]] | None = None) -> None:
+        self.index = HeuristicIndex(heuristics) \
+            if heuristics is not None else default_index()
+
+    def run(self, root: NavLevel) -> Iterator[Check]:
+        """
+        Apply the heuristics to `root` and everything below it, yielding a
+        `Check` for each heuristic applied. Nodes are visited in document
+        order, each node before its content and its children.
+        """
+        for node in walk(root):
+            yield from self.check_node(node)
+
+    def run_parallel(self, root: NavLevel, jobs: int) -> Findings:
+        """
+        Same as collecting the findings of `run()` but with the work shared
+        between `jobs` worker processes. The tree is split into subtrees,
+        such as chapters or sequentials, which the workers check and the
+        findings are merged in document order, so the result is the same as
+        for a serial run.
+
+        The workers are forked after the content has been loaded and share
+        the tree with this process copy-on-write. Where processes cannot be
+        forked, the heuristics are run in this process. A forked worker only
+        has the calling thread, with a copy of every lock as it was when
+        forking, so this must not be called while other threads may be
+        holding locks, such as threads parsing content.
+        """
+        global parallel_run
+        if jobs <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+            return collect(self.run(root))
+        units = work_units(root, jobs * UNITS_PER_JOB)
+        parallel_run = (self, units)
+        try:
+            with multiprocessing.get_context('fork').Pool(jobs) as pool:
+                parts = pool.map(check_unit, range(len(units)), chunksize = 1)
+        finally:
+            parallel_run = None
+        findings = Findings()
+        for part in parts:
+            findings.extend(part)
+        return findings
+
+    def run_stream(self, nodes: Iterable[NavLevel]) -> Iterator[Check]:
+        """
+        Same as `run()` for the navigation nodes streamed by a datatype's
+        `stream()` function. Streamed nodes do not have their children
+        attached, so only the items in their content are checked.
+        """
+        for node in nodes:
+            yield from self.check_node(node, with_node = False)
+
+    def check_node(self, node: NavLevel, with_node: bool = True) -> Iterator[Check]:
+        """
+        Apply the heuristics to a single navigation node, unless `with_node`
+        is False, and to the items in its content.
+        """
+        if with_node:
+            yield from self.check_item(node, node)
+        if not node.has_content():
+            return
+        item_types = self.index.item_types()
+        for content in node.content():
+            for cls in item_types:
+                yield from self.check_items(node, content_items(content, cls))
+
+    def check_item(self, node: NavLevel, item: Any) -> Iterator[Check]:
+        """
+        Apply the heuristics that apply to the type of `item`.
+        """
+        for heuristic in self.index.for_type(type(item)):
+            yield Check(node, item, heuristic, heuristic.cached_passes(item))
+
+
+    def check_items(self, node: NavLevel, items: Sequence[Any]) -> Iterator[Check]:
+        """
+        Apply the heuristics to a list of items of the same type in the
+        content of `node`, checking all of them at once with each heuristic's
+        `cached_passes_batch()`. The checks are yielded item by item.
+        """
+        if len(items) == 0:
+            return
+        heuristics = self.index.for_type(type(items[0]))
+        columns = [heuristic.cached_passes_batch(items) for heuristic in heuristics]
+        for (position, item) in enumerate(items):
+            for (heuristic, column) in zip(heuristics, columns):
+                yield Check(node, item, heuristic, column[position])
+
+
+def work_units(root: NavLevel, wanted: int) -> list[tuple[NavLevel, bool]]:
+    """
+    Split the tree below `root` into at least `wanted` units of work where
+    possible, in document order. Each unit is a node and whether its
+    descendants are part of the unit. The tree is split one level at a time,
+    a node that is split up being checked on its own, without descendants.
+    """
+    units = [(root, True)]
+    while len(units) < wanted:
+        split = []
+        for (node, whole) in units:
+            children = [
+                child for child in node.children() if child is not None
+            ] if whole and node.has_children() else []
+            if children:
+                split.append((node, False))
+                split.extend((child, True) for child in children)
+            else:
+                split.append((node, whole))
+        if len(split) == len(units):
+            break
+        units = split
+    return units
+
+
+def check_unit(index: int) -> Findings:
+    """
+    Check one of the units of the parallel run in progress. This is called
+    in the worker processes.
+    """
+    (engine, units) = parallel_run
+    (node, whole) = units[index]
+    return collect(engine.run(node) if whole else engine.check_node(node))
+
+
+def collect(checks: Iterable[Check], findings: Findings | None = None) -> Findings:
+    """
+    Add the checks that failed to `findings`, or to a new store if none is
+    given, and return the store.
+    """
+    if findings is None:
+        findings = Findings()
+    node = None
+    path = ''
+    for check in checks:
+        if check.passed:
+            continue
+        if check.node is not node:
+            node = check.node
+            path = node.get_path()
+        record(findings, check.heuristic, path, check.item)
+    return findings
+
+
+def record(findings: Findings, heuristic: type[Heuristic], path: str, item: Any):
+    """
+    Add the finding that `item`, found at the navigation `path`, does not
+    pass the `heuristic`.
+    """
+    findings.add(
+        heuristic.identifier(),
+        path,
+        item_location(item),
+        heuristic.severity(),
+        heuristic.description()
+    )
+
+
+def collect_texts(root: NavLevel) -> list[tuple[str, Text]]:
+    """
+    Return the text in the content of `root` and everything below it, in
+    document order, with the path of the navigation node it belongs to. This
+    is for heuristics that look at all text at once, rather than one node at
+    a time.
+    """
+    return [
+        (node.get_path(), text)
+            for (node, content) in contents(root)
+            for text in content.text()
+    ]
+
+
+def content_items(content: Content, cls: type) -> Sequence[Any]:
+    """
+    Return the items of type `cls` in the `content`, an empty list if the
+    content cannot have any.
+    """
+    getter = getattr(content, ITEM_SOURCES[cls], None)
+    return getter() if getter is not None else []
+
+
+@functools.cache
+def default_index() -> HeuristicIndex:
+    """
+    Return the index of all heuristics, built the first time it is needed.
+    """
+    return HeuristicIndex(find_all_heuristics())
+
+
+def heuristics_for(cls: type) -> list[type[Heuristic]]:
+    """
+    Return all heuristics that apply to instances of `cls`.
+    """
+    return default_index().for_type(cls)
+
+
+def find_all_heuristics(optional: bool = False) -> list[type[Heuristic]]:
+    """
+    Import all modules in the `doclint.heuristics` package and return the
+    concrete heuristics found in them, each one once. Optional heuristics
+    are left out unless `optional` is True.
+    """
+    found: list[type[Heuristic]] = []
+    for name in sorted(extensions.find_heuristics()):
+        modname = 'doclint.heuristics.' + name
+        importlib.import_module(modname)
+        for heuristic in get_heuristics(modname):
+            if inspect.isabstract(heuristic) or heuristic in found:
+                continue
+            if optional or not heuristic.optional:
+                found.append(heuristic)
+    return found
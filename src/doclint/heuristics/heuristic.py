@@ -34,17 +34,36 @@ from __future__ import annotations
 import sys, inspect
 
 from abc import ABC, abstractmethod
-from typing import Any, Sequence
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Sequence
+
+from ..structure.content import Image, Link, Text
+from ..structure.findings import Severity
 
 BASEURL = "https://corealisation.github.io/doclint/heuristics/"
 
+# The number of results kept by the `results` cache below.
+RESULT_CACHE_SIZE = 100_000
+
 class Heuristic(ABC):
     """
     Base class for heuristics that gives them an `id`, a (short) `description`
     and a `url` that points to the documentation for that heuristic. There is
     a generic `passes()` method that returns a pass/fail result.
+
+    The results of `cached_passes()` and `cached_passes_batch()` are
+    memoized by the value of the item, see `item_key()`. Heuristics whose
+    result depends on more than that, for example on where an item appears,
+    set `memoize` to False.
+
+    Heuristics that are expensive or need extra resources, such as a
+    language model, set `optional` to True. They are not run by default and
+    only used by reports that ask for them.
     """
 
+    memoize: bool = True
+    optional: bool = False
+
     @classmethod
     @abstractmethod
     def identifier(cls) -> str:
@@ -63,6 +82,14 @@ class Heuristic(ABC):
         else:
             return "No description available."
 
+    @classmethod
+    def severity(cls) -> Severity:
+        """
+        Return how serious it is if an item does not pass this heuristic.
+        Defaults to an error.
+        """
+        return Severity.ERROR
+
     @classmethod
     def url(cls) -> str:
         """
@@ -95,6 +122,135 @@ class Heuristic(ABC):
         `item`.
         """
 
+    @classmethod
+    def passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        """
+        Apply the heuristic to each of the `items` and return the results in
+        the same order. This default implementation calls `passes()` for each
+        item. Heuristics that check many items of the same kind, such as
+        links, override it to share work between the items.
+        """
+        return [cls.passes(item) for item in items]
+
+    @classmethod
+    def cached_passes(cls, item) -> bool:
+        """
+        Same as `passes()` but answered from the `results` cache if the
+        heuristic has been applied to an item with the same value before.
+        """
+        key = cls.cache_key(item)
+        if key is None:
+            return cls.passes(item)
+        passed = results.get(key)
+        if passed is None:
+            passed = cls.passes(item)
+            results.put(key, passed)
+        return passed
+
+    @classmethod
+    def cached_passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        """
+        Same as `passes_batch()` but only the items whose results are not in
+        the `results` cache are passed on to it.
+        """
+        keys = [cls.cache_key(item) for item in items]
+        passed: list[bool | None] = [
+            results.get(key) if key is not None else None for key in keys
+        ]
+        missing = [position for (position, result) in enumerate(passed) if result is None]
+        if missing:
+            checked = cls.passes_batch([items[position] for position in missing])
+            for (position, result) in zip(missing, checked):
+                passed[position] = result
+                if keys[position] is not None:
+                    results.put(keys[position], result)
+        return passed
+
+    @classmethod
+    def cache_key(cls, item) -> Hashable | None:
+        """
+        Return the key the result for `item` is cached under, None if it is
+        not to be cached.
+        """
+        if not cls.memoize:
+            return None
+        key = item_key(item)
+        return (cls.identifier(), key) if key is not None else None
+
+def item_key(item: Any) -> Hashable | None:
+    """
+    Return a canonical key for the value of an item that heuristics are
+    applied to: `(text, url)` for links, `(src, alt_text)` for images and
+    the text itself for text. Returns None for other items, whose results
+    are not cached.
+    """
+    if isinstance(item, Link):
+        return ('link', item.text, item.url)
+    if isinstance(item, Image):
+        return ('image', item.src, item.alt_text)
+    if isinstance(item, Text):
+        return ('text', item.text)
+    return None
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of a `ResultCache`.
+    """
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+class ResultCache:
+    """
+    A cache of heuristic results that evicts the least recently used entry
+    once it holds `maxsize` entries, counting hits and misses.
+    """
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.entries: OrderedDict[Hashable, bool] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> bool | None:
+        """
+        Return the cached result for `key`, None if there is none.
+        """
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, key: Hashable, result: bool) -> None:
+        """
+        Cache the `result` for `key`.
+        """
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last = False)
+
+    def info(self) -> CacheInfo:
+        """
+        Return the number of hits and misses and the size of the cache.
+        """
+        return CacheInfo(self.hits, self.misses, len(self.entries), self.maxsize)
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the counters.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+# The results of heuristics, shared by all of them.
+results = ResultCache()
+
 class HeuristicTypeException(Exception):
     """
     Exception thrown when a Heuristic cannot be applied to the `item` provided
@@ -26,7 +26,7 @@
 Heuristics for images.
 """
 
-from typing import Sequence
+from typing import Any, Sequence
 from .heuristic import Heuristic, HeuristicTypeException
 from ..structure.content import Image
 
@@ -56,4 +56,71 @@ class CheckImageAltText(Heuristic):
         if image.alt_text == "":
             return False
         return True
-    
+
+    @classmethod
+    def passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        for item in items:
+            if not isinstance(item, Image):
+                raise HeuristicTypeException(cls, item)
+        return [bool(image.alt_text) for image in items]
+
+# Images wider or higher than this many pixels are larger than any screen
+# they are shown on needs.
+MAX_DIMENSION = 2000
+
+# Images larger than this many megabytes make pages slow to load.
+MAX_SIZE_MB = 1.0
+
+class CheckImageDimensions(Heuristic):
+    """Images should not be larger than 2000 pixels in either direction."""
+
+    # The result depends on the file an image refers to, not just its `src`.
+    memoize = False
+
+    @classmethod
+    def identifier(cls) -> str:
+        return "dl-image-dimensions"
+
+    @classmethod
+    def applies_to(cls, item) -> bool:
+        return isinstance(item, Image)
+
+    @classmethod
+    def applies_to_types(cls) -> Sequence[type]:
+        return [Image]
+
+    @classmethod
+    def passes(cls, item) -> bool:
+        if not isinstance(item, Image):
+            raise HeuristicTypeException(cls, item)
+        dimensions = item.get_dimensions()
+        if dimensions is None:
+            return True
+        return max(dimensions) <= MAX_DIMENSION
+
+class CheckImageFileSize(Heuristic):
+    """Image files should not be larger than 1 MB."""
+
+    # The result depends on the file an image refers to, not just its `src`.
+    memoize = False
+
+    @classmethod
+    def identifier(cls) -> str:
+        return "dl-image-file-size"
+
+    @classmethod
+    def applies_to(cls, item) -> bool:
+        return isinstance(item, Image)
+
+    @classmethod
+    def applies_to_types(cls) -> Sequence[type]:
+        return [Image]
+
+    @classmethod
+    def passes(cls, item) -> bool:
+        if not isinstance(item, Image):
+            raise HeuristicTypeException(cls, item)
+        size = item.get_size()
+        if size is None:
+            return True
+        return size <= MAX_SIZE_MB
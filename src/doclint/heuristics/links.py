@@ -31,8 +31,24 @@ from typing import Any, Sequence
 
 from urllib.parse import urlparse
 from ..structure.content import Link
+from ..util.liveness import LinkChecker, is_external
 from .heuristic import Heuristic, HeuristicTypeException
 
+# Link texts that do not describe where a link goes.
+VAGUE_TEXT = re.compile(r"\Where\W|here")
+VAGUE_PHRASES = frozenset(["this link", "this page"])
+
+# Prefixes of URLs that point to search results or search engine redirects.
+SEARCH_PREFIXES = ('https://www.google.com/search', 'https://www.google.com/url')
+
+def check_links(heuristic: type[Heuristic], items: Sequence[Any]):
+    """
+    Raise a `HeuristicTypeException` if any of the `items` is not a `Link`.
+    """
+    for item in items:
+        if not isinstance(item, Link):
+            raise HeuristicTypeException(heuristic, item)
+
 class CheckLinkText(Heuristic):
     """links should have descriptive link texts, not `here` or `this page`."""
 
@@ -53,13 +69,20 @@ class CheckLinkText(Heuristic):
         if not isinstance(item, Link):
             raise HeuristicTypeException(cls, item)
 
-        link = item
-        if re.fullmatch(r"\Where\W", link.text) \
-            or re.fullmatch(r"^here$", link.text) \
-            or link.text == "this link" \
-            or link.text == "this page":
-            return False
-        return True
+        return cls.text_passes(item.text)
+
+    @classmethod
+    def passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        check_links(cls, items)
+        results: dict[str, bool] = {}
+        for link in items:
+            if link.text not in results:
+                results[link.text] = cls.text_passes(link.text)
+        return [results[link.text] for link in items]
+
+    @classmethod
+    def text_passes(cls, text: str) -> bool:
+        return text not in VAGUE_PHRASES and VAGUE_TEXT.fullmatch(text) is None
 
 class CheckUrl(Heuristic):
     """URLs need to be valid."""
@@ -80,9 +103,24 @@ class CheckUrl(Heuristic):
     def passes(cls, item: Link) -> bool:
         if not isinstance(item, Link):
             raise HeuristicTypeException(cls, item)
-        link = item
+        return cls.url_passes(item.url)
+
+    @classmethod
+    def passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        check_links(cls, items)
+        results: dict[str | None, bool] = {}
+        for link in items:
+            if link.url not in results:
+                results[link.url] = cls.url_passes(link.url)
+        return [results[link.url] for link in items]
+
+    @classmethod
+    def url_passes(cls, url: str | None) -> bool:
+        # anchors such as <a name="x"> have no URL, so nothing to check
+        if url is None:
+            return True
         try:
-            urlparse(link.url)
+            urlparse(url)
         except ValueError:
             return False
         return True
@@ -107,8 +145,91 @@ class CheckUrlNoSearch(Heuristic):
         if not isinstance(item, Link):
             raise HeuristicTypeException(cls, item)
 
-        link = item
-        if link.url.startswith('https://www.google.com/search') \
-            or link.url.startswith('https://www.google.com/url'):
-            return False
-        return True
+        return cls.url_passes(item.url)
+
+    @classmethod
+    def passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        check_links(cls, items)
+        return [cls.url_passes(link.url) for link in items]
+
+    @classmethod
+    def url_passes(cls, url: str | None) -> bool:
+        return url is None or not url.startswith(SEARCH_PREFIXES)
+
+class CheckInternalLink(Heuristic):
+    """Internal links should go to something that exists in the documentation."""
+
+    # Whether a target exists depends on the documentation the link is in,
+    # not just on the link, so results are not memoized.
+    memoize = False
+
+    @classmethod
+    def identifier(cls) -> str:
+        return "dl-link-internal"
+
+    @classmethod
+    def applies_to(cls, item) -> bool:
+        return isinstance(item, Link)
+
+    @classmethod
+    def applies_to_types(cls) -> Sequence[type]:
+        return [Link]
+
+    @classmethod
+    def passes(cls, item: Link) -> bool:
+        if not isinstance(item, Link):
+            raise HeuristicTypeException(cls, item)
+
+        return not item.internal or item.target is not None
+
+    @classmethod
+    def passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        check_links(cls, items)
+        return [not link.internal or link.target is not None for link in items]
+
+class CheckUrlAlive(Heuristic):
+    """The targets of external links should exist."""
+
+    # Whether a link is alive changes over time, so results are not memoized
+    # with those of other heuristics but kept by the `checker`, which can
+    # have a cache with an expiry time.
+    memoize = False
+    optional = True
+    checker: LinkChecker | None = None
+
+    @classmethod
+    def identifier(cls) -> str:
+        return "dl-link-url-alive"
+
+    @classmethod
+    def applies_to(cls, item) -> bool:
+        return isinstance(item, Link)
+
+    @classmethod
+    def applies_to_types(cls) -> Sequence[type]:
+        return [Link]
+
+    @classmethod
+    def passes(cls, item) -> bool:
+        return cls.passes_batch([item])[0]
+
+    @classmethod
+    def passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        check_links(cls, items)
+        statuses = cls.get_checker().check(
+            link.url for link in items if is_external(link.url)
+        )
+        return [
+            statuses[link.url].alive if is_external(link.url) else True
+                for link in items
+        ]
+
+    @classmethod
+    def get_checker(cls) -> LinkChecker:
+        """
+        Return the checker used for URLs, creating one without a cache if
+        none has been set.
+        """
+        if cls.checker is None:
+            cls.checker = LinkChecker()
+        return cls.checker
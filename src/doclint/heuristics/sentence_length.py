@@ -22,10 +22,150 @@
 # SOFTWARE.
 # =============================================================================
 
-# pylint: disable=C0116 # no warnings about missing docstrings
 
-def is_auto():
-    return True
+"""
+Heuristics for the length of sentences and paragraphs. Texts are split into
+sentences by spaCy. The texts are sent through `nlp.pipe()` in batches, and
+all pipeline components except sentence segmentation are disabled. The model
+is only loaded when one of these heuristics is first used. They are optional
+heuristics, so they do not run unless a report such as `readability` asks for
+them.
+"""
 
-def check():
-    pass
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from ..structure.content import Text
+from .heuristic import Heuristic, HeuristicTypeException
+
+# The spaCy pipeline used for sentence segmentation. If it is not installed,
+# a blank English pipeline with a rule-based sentencizer is used instead.
+MODEL = 'en_core_web_sm'
+
+# Texts are sent to spaCy in batches of this size.
+BATCH_SIZE = 256
+
+# Sentences with more words than this are hard to follow.
+MAX_SENTENCE_WORDS = 25
+
+# Paragraphs with more sentences than this should be broken up.
+MAX_PARAGRAPH_SENTENCES = 6
+
+# Number of processes that `nlp.pipe()` uses, set by reports.
+n_process = 1
+
+# The loaded pipeline, see `get_nlp()`.
+nlp = None
+
+# The number of words in each sentence of the texts segmented so far.
+segmented: dict[str, list[int]] = {}
+
+
+def get_nlp():
+    """
+    Return the spaCy pipeline, loading it the first time it is needed with
+    everything except sentence segmentation disabled.
+    """
+    global nlp
+    if nlp is None:
+        import spacy
+        try:
+            nlp = spacy.load(MODEL, enable = ['senter'])
+        except OSError: # model not installed
+            nlp = spacy.blank('en')
+            nlp.add_pipe('sentencizer')
+    return nlp
+
+
+def segment(texts: Sequence[str]) -> list[list[int]]:
+    """
+    Return the number of words in each sentence of each of the `texts`.
+    Texts that have not been segmented before are sent through the pipeline
+    together, in batches of `BATCH_SIZE`.
+    """
+    missing = list(dict.fromkeys(text for text in texts if text not in segmented))
+    if missing:
+        docs = get_nlp().pipe(missing, batch_size = BATCH_SIZE, n_process = n_process)
+        for (text, doc) in zip(missing, docs):
+            segmented[text] = [
+                sum(1 for token in sentence if not (token.is_punct or token.is_space))
+                    for sentence in doc.sents
+            ]
+    return [segmented[text] for text in texts]
+
+
+def clear():
+    """
+    Forget the texts segmented so far.
+    """
+    segmented.clear()
+
+
+def check_texts(heuristic: type[Heuristic], items: Sequence[Any]):
+    """
+    Raise a `HeuristicTypeException` if any of the `items` is not a `Text`.
+    """
+    for item in items:
+        if not isinstance(item, Text):
+            raise HeuristicTypeException(heuristic, item)
+
+
+class CheckSentenceLength(Heuristic):
+    """Sentences should be short, with no more than 25 words."""
+
+    optional = True
+
+    @classmethod
+    def identifier(cls) -> str:
+        return "dl-sentence-length"
+
+    @classmethod
+    def applies_to(cls, item) -> bool:
+        return isinstance(item, Text)
+
+    @classmethod
+    def applies_to_types(cls) -> Sequence[type]:
+        return [Text]
+
+    @classmethod
+    def passes(cls, item) -> bool:
+        return cls.passes_batch([item])[0]
+
+    @classmethod
+    def passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        check_texts(cls, items)
+        return [
+            all(words <= MAX_SENTENCE_WORDS for words in lengths)
+                for lengths in segment([item.text for item in items])
+        ]
+
+
+class CheckParagraphLength(Heuristic):
+    """Paragraphs should be short, with no more than 6 sentences."""
+
+    optional = True
+
+    @classmethod
+    def identifier(cls) -> str:
+        return "dl-paragraph-length"
+
+    @classmethod
+    def applies_to(cls, item) -> bool:
+        return isinstance(item, Text)
+
+    @classmethod
+    def applies_to_types(cls) -> Sequence[type]:
+        return [Text]
+
+    @classmethod
+    def passes(cls, item) -> bool:
+        return cls.passes_batch([item])[0]
+
+    @classmethod
+    def passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        check_texts(cls, items)
+        return [
+            len(lengths) <= MAX_PARAGRAPH_SENTENCES
+                for lengths in segment([item.text for item in items])
+        ]
@@ -0,0 +1,210 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Heuristic for spelling, using pyenchant. Text is split into words and each
+distinct word is only looked up in the dictionary once, as the vocabulary of
+a course is small compared with the number of words in it. The results of
+lookups are kept in `known` and can be saved to and loaded from a directory.
+Saved results are only used with the same dictionary, see
+`dictionary_identity()`, so words are looked up again after a dictionary
+is installed or replaced or the personal word list is changed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from ..structure.content import Text
+from .heuristic import Heuristic, HeuristicTypeException
+
+# The dictionary that words are looked up in.
+LANGUAGE = 'en_US'
+
+# Bump this whenever the format of the saved results changes.
+WORDS_FORMAT = 1
+
+# Words: runs of letters, possibly joined by apostrophes as in "don't".
+WORD = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+
+# The loaded dictionary, see `get_dictionary()`.
+dictionary = None
+
+# Whether each word looked up so far is spelled correctly.
+known: dict[str, bool] = {}
+
+
+def get_dictionary():
+    """
+    Return the enchant dictionary, loading it the first time it is needed.
+    """
+    global dictionary
+    if dictionary is None:
+        import enchant
+        dictionary = enchant.Dict(LANGUAGE)
+    return dictionary
+
+
+def dictionary_identity() -> dict[str, Any]:
+    """
+    Return what identifies the dictionary that words are looked up in: the
+    format of saved results, the language, the enchant version, the
+    provider of the dictionary and the size and modification time of the
+    personal word list for the language, if there is one. Results saved
+    with a different identity are not used.
+    """
+    import enchant
+    loaded = get_dictionary()
+    provider = getattr(loaded, 'provider', None)
+    tag = getattr(loaded, 'tag', LANGUAGE)
+    config = os.environ.get('ENCHANT_CONFIG_DIR') \
+        or Path.home().joinpath('.config', 'enchant')
+    try:
+        stat = Path(config).joinpath(f'{tag}.dic').stat()
+        personal = [stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        personal = None
+    return {
+        'format': WORDS_FORMAT,
+        'language': tag,
+        'enchant': getattr(enchant, '__version__', None),
+        'provider': getattr(provider, 'name', None),
+        'provider_file': getattr(provider, 'file', None),
+        'personal': personal,
+    }
+
+
+def words(text: str) -> list[str]:
+    """
+    Return the words in `text` that are checked. Single letters and words in
+    capitals, which are mostly acronyms, are skipped.
+    """
+    return [
+        word for word in WORD.findall(text)
+            if len(word) > 1 and not word.isupper()
+    ]
+
+
+def vocabulary(texts: Iterable[str]) -> list[str]:
+    """
+    Return the distinct words in the `texts`, in the order they first appear.
+    """
+    found: dict[str, None] = {}
+    for text in texts:
+        for word in words(text):
+            found[word] = None
+    return list(found)
+
+
+def check_words(vocabulary: Iterable[str]) -> None:
+    """
+    Look up the words in `vocabulary` that have not been looked up before.
+    """
+    missing = [word for word in vocabulary if word not in known]
+    if missing:
+        check = get_dictionary().check
+        for word in missing:
+            known[word] = check(word)
+
+
+def misspelled(text: str) -> list[str]:
+    """
+    Return the misspelled words in `text`, once for each time they occur.
+    """
+    found = words(text)
+    check_words(found)
+    return [word for word in found if not known[word]]
+
+
+def words_file(directory: Path) -> Path:
+    """
+    Return the file that the results of lookups are saved in.
+    """
+    return Path(directory).joinpath(f'spelling-{LANGUAGE}.json')
+
+
+def load_words(directory: Path) -> None:
+    """
+    Add the results of lookups saved in `directory` to `known`, if there are
+    any and they were saved with the same dictionary.
+    """
+    try:
+        with open(words_file(directory), 'r', encoding = 'utf-8') as fd:
+            saved = json.load(fd)
+    except (OSError, ValueError):
+        return
+    if isinstance(saved, dict) and saved.get('dictionary') == dictionary_identity():
+        known.update(saved.get('words', {}))
+
+
+def save_words(directory: Path) -> None:
+    """
+    Save the results of all lookups so far in `directory`.
+    """
+    target = words_file(directory)
+    (fd, tmpname) = tempfile.mkstemp(dir = target.parent, suffix = '.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding = 'utf-8') as tmp:
+            json.dump({'dictionary': dictionary_identity(), 'words': known}, tmp)
+        os.replace(tmpname, target)
+    except OSError:
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
+
+
+class CheckSpelling(Heuristic):
+    """Text should not contain spelling mistakes."""
+
+    optional = True
+
+    @classmethod
+    def identifier(cls) -> str:
+        return "dl-spelling"
+
+    @classmethod
+    def applies_to(cls, item) -> bool:
+        return isinstance(item, Text)
+
+    @classmethod
+    def applies_to_types(cls) -> Sequence[type]:
+        return [Text]
+
+    @classmethod
+    def passes(cls, item) -> bool:
+        return cls.passes_batch([item])[0]
+
+    @classmethod
+    def passes_batch(cls, items: Sequence[Any]) -> list[bool]:
+        for item in items:
+            if not isinstance(item, Text):
+                raise HeuristicTypeException(cls, item)
+        check_words(vocabulary(item.text for item in items))
+        return [all(known[word] for word in words(item.text)) for item in items]
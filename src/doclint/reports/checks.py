@@ -0,0 +1,78 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Report that runs all heuristics in a single pass over the navigation
+structure and lists the checks that failed.
+"""
+
+from typing import Iterable
+
+from rich.console import Console
+
+from ..structure.findings import Findings, print_findings
+from ..structure.navigation import NavLevel
+from ..heuristics.engine import Engine, collect
+
+console = Console(highlight=False, record=True)
+
+def print_help():
+    print(
+        "Applies every heuristic to the course and lists what fails them, by navigation path."
+        " Runs the heuristics in parallel with --jobs."
+    )
+
+def report(node: NavLevel, output = None, jobs: int = 1) -> Findings:
+    """
+    Apply every heuristic that applies to the navigation nodes and the items
+    in their content, walking the structure once. With `jobs` greater than
+    one, the heuristics are run by that many worker processes. Returns the
+    findings.
+    """
+    findings = Engine().run_parallel(node, jobs)
+    print_findings(findings, console)
+    if output:
+        write_output(output)
+    return findings
+
+def report_stream(nodes: Iterable[NavLevel], output = None) -> Findings:
+    """
+    Same as `report()` but for the navigation nodes streamed by a datatype's
+    `stream()` function. The navigation structure itself is not checked as
+    streamed nodes come without their children.
+    """
+    findings = collect(Engine().run_stream(nodes))
+    print_findings(findings, console)
+    if output:
+        write_output(output)
+    return findings
+
+def write_output(output):
+    """
+    Write what has been printed to the console to the `output` file as HTML.
+    """
+    html = console.export_html()
+    with open(output, 'w', encoding='utf8') as fd:
+        fd.write(html)
@@ -0,0 +1,124 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Report that finds HTML content that is nearly the same as content elsewhere,
+as happens when courses are copied and adapted over several terms. Uses
+MinHash signatures and an LSH index, see `doclint.util.minhash`, so the time
+taken grows roughly linearly with the amount of content.
+"""
+
+from rich.console import Console
+from rich.table import Table
+
+from ..structure.content import HTMLContent
+from ..structure.findings import Findings, Severity
+from ..structure.navigation import NavLevel, contents
+from ..util.minhash import LSHIndex, MinHasher, shingles
+
+console = Console(highlight=False, record=True)
+
+# Pairs of content with at least this estimated similarity are reported.
+THRESHOLD = 0.8
+
+IDENTIFIER = 'dl-near-duplicate'
+DESCRIPTION = 'Content should not be repeated with only small changes.'
+
+COPY_IDENTIFIER = 'dl-duplicate'
+COPY_DESCRIPTION = 'Content should not be repeated.'
+
+def print_help():
+    print(
+        "Lists groups of HTML content with the same text and pairs of content"
+        f" whose text is at least {THRESHOLD:.0%} similar."
+    )
+
+def report(node: NavLevel, output = None) -> Findings:
+    """
+    List the groups of HTML content with the same text, each group once,
+    and then the pairs of HTML content from different groups whose text is
+    estimated to be at least `THRESHOLD` similar, with the navigation paths
+    of both. Returns a finding for each group and each pair.
+    """
+    paths = []
+    hasher = MinHasher()
+    index = LSHIndex()
+    signatures = {} # by digest, so that copies of a file are hashed once
+    for (path, content) in collect_html(node):
+        signature = signatures.get(content.digest) if content.digest is not None else None
+        if signature is None:
+            words = shingles(content.plain_text())
+            if not words:
+                continue
+            signature = hasher.signature(words)
+            if content.digest is not None:
+                signatures[content.digest] = signature
+        paths.append(path)
+        index.add(signature)
+
+    findings = Findings()
+    groups = index.duplicates()
+    table = Table(title = f'{len(groups)} groups of content with the same text')
+    table.add_column('content')
+    table.add_column('copies')
+    table.add_column('count', justify = 'right')
+    for group in groups:
+        table.add_row(paths[group[0]], '\n'.join(paths[i] for i in group[1:]), str(len(group)))
+        findings.add(
+            COPY_IDENTIFIER,
+            paths[group[0]],
+            f"same as {len(group) - 1} other(s), first {paths[group[1]]}",
+            Severity.WARNING,
+            COPY_DESCRIPTION
+        )
+    console.print(table)
+
+    pairs = index.similar(THRESHOLD)
+    table = Table(title = f'{len(pairs)} pairs of near-duplicate content')
+    table.add_column('content')
+    table.add_column('similar to')
+    table.add_column('similarity', justify = 'right')
+    for (first, second, similarity) in pairs:
+        table.add_row(paths[first], paths[second], f"{similarity:.2f}")
+        findings.add(
+            IDENTIFIER,
+            paths[first],
+            f"similar to {paths[second]} ({similarity:.2f})",
+            Severity.WARNING,
+            DESCRIPTION
+        )
+    console.print(table)
+    if output:
+        html = console.export_html()
+        with open(output, 'w', encoding = 'utf8') as fd:
+            fd.write(html)
+    return findings
+
+def collect_html(root: NavLevel) -> list[tuple[str, HTMLContent]]:
+    """
+    Return the HTML content of `root` and everything below it, in document
+    order, with the path of the navigation node it belongs to.
+    """
+    return [(node.get_path(), content) for (node, content) in contents(root, HTMLContent)]
@@ -25,43 +25,100 @@
 """
 Report on embedded images.
 """
+from typing import Iterable
+
 from rich.console import Console
 
-from ..structure.navigation import NavLevel
-from ..structure.content import HTMLContent
+from ..structure.navigation import NavLevel, contents
+from ..structure.content import HTMLContent, Image
+from ..structure.findings import Findings, print_findings
+from ..heuristics.engine import heuristics_for, record
 from ..heuristics.heuristic import Heuristic, HeuristicTypeException
-from ..heuristics.heuristic import get_heuristics
-from ..heuristics import images
 
 console = Console(highlight= False, record=True)
-heuristics = get_heuristics('doclint.heuristics.images')
+heuristics = heuristics_for(Image)
 
 def print_help():
     print("[bold magenta]World[/bold magenta]")
     pass
 
-def report(node: NavLevel, output = None):
+def report(node: NavLevel, output = None) -> Findings:
+    """
+    Checks all images and prints the findings. Returns the findings.
+    """
+    findings = Findings()
+    check_tree(node, {}, findings)
+    print_findings(findings, console)
+    if output:
+        write_output(output)
+    return findings
+
+def check_tree(node: NavLevel, checked: dict, findings: Findings):
+    """
+    Check the images in the content of a navigation node and its descendants.
+    """
+    for (descendant, content) in contents(node, HTMLContent):
+        check_images(content, descendant.get_path(), checked, findings)
+
+def report_stream(nodes: Iterable[NavLevel], output = None) -> Findings:
+    """
+    Same as `report()` but for the navigation nodes streamed by a datatype's
+    `stream()` function. The findings for each node are printed as soon as
+    it has been checked.
+    """
+    findings = Findings()
+    checked: dict = {}
+    for node in nodes:
+        found = Findings()
+        check_node(node, checked, found)
+        print_findings(found, console)
+        findings.extend(found)
+    if output:
+        write_output(output)
+    return findings
+
+def check_node(node: NavLevel, checked: dict, findings: Findings):
     """
-    Checks all images
+    Check the images in the HTML content of a single navigation node and add
+    what is found to `findings`. Results for content with a digest are kept
+    in `checked` so that copies of the same content elsewhere are not checked
+    again.
     """
     if node.has_content():
         for content in node.content():
             if isinstance(content, HTMLContent):
-                check_images(content, node)
-    if node.has_children():
-        for child in node.children():
-            if child is not None:
-                report(child)
+                check_images(content, node.get_path(), checked, findings)
 
-    if output:
-        html = console.export_html()
-        with open(output, 'w', encoding = 'utf8') as fd:
-            fd.write(html)
+def write_output(output):
+    """
+    Write what has been printed to the console to the `output` file as HTML.
+    """
+    html = console.export_html()
+    with open(output, 'w', encoding = 'utf8') as fd:
+        fd.write(html)
+
+def check_images(content: HTMLContent, path: str, checked: dict, findings: Findings):
+    results = image_failures(content, checked)
+    for (image, failures) in zip(content.images(), results):
+        for heuristic in failures:
+            record(findings, heuristic, path, image)
 
-def check_images(content: HTMLContent, parent: NavLevel):
-    console.print(f"[magenta]{parent.get_path()}[/magenta]")
-    for image in content.images():
-        for heuristic in heuristics:
-            if not heuristic.passes(image):
-                console.print(f"❌ {image.src}")
-                console.print(f"[red]{heuristic.description()}[/red]")
\ No newline at end of file
+def image_failures(content: HTMLContent, checked: dict | None = None):
+    """
+    Return the heuristics each image in the content fails, taken from
+    `checked` if content with the same digest and the same assets has been
+    checked before. Copies of the content in different places can refer to
+    different image files.
+    """
+    key = (content.digest, content.assets)
+    if checked is not None and content.digest is not None and key in checked:
+        return checked[key]
+    images = content.images()
+    columns = [heuristic.cached_passes_batch(images) for heuristic in heuristics]
+    results = [
+        [heuristic for (heuristic, passed) in zip(heuristics, row) if not passed]
+            for row in (zip(*columns) if columns else [()] * len(images))
+    ]
+    if checked is not None and content.digest is not None:
+        checked[key] = results
+    return results
@@ -28,56 +28,163 @@ Report that checks links - link text, URL and attributes.
 
 import inspect
 import sys
-from typing import Sequence, Tuple
+from typing import Iterable, Sequence, Tuple
 
 from rich.console import Console
-from ..structure.navigation import NavLevel
-from ..structure.content import Link
-from ..heuristics import links
+from ..structure.navigation import NavLevel, walk
+from ..structure.content import Content, Link
+from ..structure.findings import Findings, print_findings
+from ..heuristics.engine import heuristics_for, record
 from ..heuristics.heuristic import Heuristic, HeuristicTypeException
-from ..heuristics.heuristic import get_heuristics
 
 console = Console(highlight=False, record=True)
-heuristics = get_heuristics('doclint.heuristics.links')
+heuristics = heuristics_for(Link)
 
 def print_help():
     print("[bold magenta]World[/bold magenta]")
     pass
 
 
-def report(node: NavLevel, output = None):
+def report(node: NavLevel, output = None, verbose: bool = False) -> Findings:
     """
-    Lists all the links in the content and adds the results of applying
-    link heuristics.
+    Applies the link heuristics to all the links in the content and prints
+    the links that failed. With `verbose` set, every link is listed as it is
+    checked, including those that passed. Returns the findings for the links
+    that failed.
+    """
+    findings = Findings()
+    check_tree(node, {}, findings, verbose)
+    if not verbose:
+        print_findings(findings, console)
+    if output:
+        write_output(output)
+    return findings
+
+
+def check_tree(
+    node: NavLevel,
+    checked: dict,
+    findings: Findings | None = None,
+    verbose: bool = False
+    ):
+    """
+    Check the links in the content of a navigation node and its descendants.
+    """
+    for descendant in walk(node):
+        check_node(descendant, checked, findings, verbose)
+
+
+def report_stream(nodes: Iterable[NavLevel], output = None, verbose: bool = False) -> Findings:
+    """
+    Same as `report()` but for the navigation nodes streamed by a datatype's
+    `stream()` function. Results are printed as the nodes arrive.
+    """
+    findings = Findings()
+    checked: dict = {}
+    for node in nodes:
+        found = Findings()
+        check_node(node, checked, found, verbose)
+        if not verbose:
+            print_findings(found, console)
+        findings.extend(found)
+    if output:
+        write_output(output)
+    return findings
+
+
+def check_node(
+    node: NavLevel,
+    checked: dict | None = None,
+    findings: Findings | None = None,
+    verbose: bool = False
+    ):
+    """
+    Check the links in the content of a single navigation node. Results for
+    content with a digest are kept in `checked`, if given, so that copies of
+    the same content elsewhere are not checked again. Links that fail are
+    added to `findings`, if given. With `verbose` set, each link is printed
+    with its result.
     """
     if node.has_content():
         for content in node.content():
-            check_links(content.links(), node)
-    if node.has_children():
-        for child in node.children():
-            if child is not None:
-                report(child)
-    if output:
-        html = console.export_html()
-        with open(output, 'w', encoding='utf8') as fd:
-            fd.write(html)
+            check_links(
+                content.links(),
+                node,
+                check_content(content, checked),
+                findings,
+                verbose
+            )
 
 
-def check_links(links: list[Link], parent: NavLevel):
+def check_content(
+    content: Content,
+    checked: dict | None = None
+    ) -> list[Tuple[bool, Sequence[type[Heuristic]]]]:
+    """
+    Return the result of `check_link()` for each link in the content, taken
+    from `checked` if content with the same digest and the same targets for
+    internal links has been checked before.
     """
-    Iterate over links, run heuristics, report results
+    digest = getattr(content, 'digest', None)
+    key = (digest, getattr(content, 'targets', None))
+    if checked is not None and digest is not None and key in checked:
+        return checked[key]
+    results = check_link_batch(content.links())
+    if checked is not None and digest is not None:
+        checked[key] = results
+    return results
+
+
+def write_output(output):
+    """
+    Write what has been printed to the console to the `output` file as HTML.
+    """
+    html = console.export_html()
+    with open(output, 'w', encoding='utf8') as fd:
+        fd.write(html)
+
+
+def check_links(
+    links: list[Link],
+    parent: NavLevel,
+    results: list[Tuple[bool, Sequence[type[Heuristic]]]] | None = None,
+    findings: Findings | None = None,
+    verbose: bool = False
+    ):
+    """
+    Iterate over links and run heuristics. The `results` can be passed in if
+    the links have already been checked. Links that fail are added to
+    `findings`, if given. With `verbose` set, every link is printed with its
+    result.
     """
     if len(links) == 0:
         return
-    console.print(f"[magenta]{parent.get_path()}[/magenta]")
-    for link in links:
-        (success, failures) = check_link(link)
-        if success:
-            console.print(f"✅ {link.text} -> {link.url}")
-        else:
-            console.print(f"❌ {link.text} -> {link.url}")
-            for failure in failures:
+    if results is None:
+        results = check_link_batch(links)
+    path = parent.get_path()
+    if verbose:
+        console.print(f"[magenta]{path}[/magenta]")
+    for (link, (success, failures)) in zip(links, results):
+        if verbose:
+            console.print(f"{'✅' if success else '❌'} {link.text} -> {link.url}")
+        for failure in failures:
+            if verbose:
                 console.print(f"   [red]{failure.identifier()}: {failure.description()}[/red]")
+            if findings is not None:
+                record(findings, failure, path, link)
+
+
+def check_link_batch(links: list[Link]) -> list[Tuple[bool, Sequence[type[Heuristic]]]]:
+    """
+    Same as `check_link()` for a list of links, using each heuristic's
+    `cached_passes_batch()` to check all of them at once.
+    """
+    columns = [heuristic.cached_passes_batch(links) for heuristic in heuristics]
+    results = []
+    for row in zip(*columns) if columns else [()] * len(links):
+        failures = [heuristic for (heuristic, passed) in zip(heuristics, row) if not passed]
+        results.append((not failures, failures))
+    return results
 
 
 def check_link(link: Link) -> Tuple[bool, Sequence[type[Heuristic]]]:
@@ -90,7 +197,7 @@ def check_link(link: Link) -> Tuple[bool, Sequence[type[Heuristic]]]:
     passes: bool = True
     failures: list[type[Heuristic]] = []
     for heuristic in heuristics:
-        passes_this = heuristic.passes(link)
+        passes_this = heuristic.cached_passes(link)
         if not passes_this:
             passes = False
             failures.append(heuristic)
@@ -0,0 +1,90 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Report that checks whether the targets of external links are alive. Each
+distinct URL in the course is requested once, see `doclint.util.liveness`.
+"""
+
+from rich.console import Console
+
+from ..structure.content import Link
+from ..structure.findings import Findings, print_findings
+from ..structure.navigation import NavLevel, contents
+from ..heuristics.links import CheckUrlAlive
+from ..util.cache import ParseCache
+from ..util.liveness import LinkCache, LinkChecker, is_external
+
+console = Console(highlight=False, record=True)
+
+def print_help():
+    print(
+        "Lists external links whose targets cannot be reached or respond with an error."
+        " Keeps results in the --cache directory between runs."
+    )
+
+def report(node: NavLevel, output = None, cache: ParseCache | None = None) -> Findings:
+    """
+    List the external links whose targets cannot be reached or respond with
+    an error. If a `cache` is given, results are kept in its directory and
+    URLs checked recently are not requested again. Returns the findings.
+    """
+    link_cache = LinkCache(cache.directory) if cache is not None else None
+    CheckUrlAlive.checker = LinkChecker(cache = link_cache)
+    links = [(path, link) for (path, link) in collect_links(node) if is_external(link.url)]
+    statuses = CheckUrlAlive.checker.check(link.url for (_, link) in links)
+    if link_cache is not None:
+        link_cache.save()
+    findings = Findings()
+    heuristic = CheckUrlAlive
+    for (path, link) in links:
+        status = statuses[link.url]
+        if not status.alive:
+            findings.add(
+                heuristic.identifier(),
+                path,
+                f"{link.text} -> {link.url} ({status.describe()})",
+                heuristic.severity(),
+                heuristic.description()
+            )
+    dead = sum(1 for status in statuses.values() if not status.alive)
+    console.print(f"{len(statuses)} distinct external URLs, {dead} not alive")
+    print_findings(findings, console)
+    if output:
+        html = console.export_html()
+        with open(output, 'w', encoding = 'utf8') as fd:
+            fd.write(html)
+    return findings
+
+def collect_links(root: NavLevel) -> list[tuple[str, Link]]:
+    """
+    Return the links in the content of `root` and everything below it, in
+    document order, with the path of the navigation node they are in.
+    """
+    return [
+        (node.get_path(), link)
+            for (node, content) in contents(root)
+            for link in content.links()
+    ]
@@ -27,44 +27,44 @@ Report on the navigation structure.
 """
 from rich.console import Console
 
-from ..structure.navigation import NavLevel
+from ..structure.findings import Findings, print_findings
+from ..structure.navigation import NavLevel, walk
+from ..heuristics.engine import heuristics_for, record
 from ..heuristics.heuristic import Heuristic, HeuristicTypeException
-from ..heuristics.heuristic import get_heuristics
-from ..heuristics import navigation
 
 console = Console(highlight= False, record=True)
-heuristics = get_heuristics('doclint.heuristics.navigation')
 
 def print_help():
     print("[bold magenta]World[/bold magenta]")
     pass
 
-def report(node: NavLevel, output = None):
+def report(node: NavLevel, output = None) -> Findings:
     """
-    Report that lists the navigation structure and applies checks such as for
-    a maximum allowed depth or the maximum allowed number of elements at each
-    level.
+    Report that applies checks to the navigation structure such as for a
+    maximum allowed depth or the maximum allowed number of elements at each
+    level. Prints and returns the findings.
     """
-    check_navlevel(node)
-    if node.has_children():
-        for child in node.children():
-            if child is not None:
-                report(child)
-    
+    findings = Findings()
+    check_tree(node, findings)
+    print_findings(findings, console)
     if output is not None:
         html = console.export_html()
         with open(output, 'w', encoding = 'utf8') as fd:
             fd.write(html)
+    return findings
 
-def check_navlevel(node) -> None:
+def check_tree(node: NavLevel, findings: Findings) -> None:
     """
-    Run heuristics on the given navigation level and write results to the
-    console.
+    Run heuristics on a navigation level and all levels below it.
     """
-    console.print(f"[magenta]{node.get_path()}[/magenta]")
-    for heuristic in heuristics:
-        passes_this = heuristic.passes(node)
-        if not passes_this:
-            console.print(f"❌ {heuristic.identifier()}")
-            console.print(f"[red]{heuristic.description()}[/red]")
-    
+    for descendant in walk(node):
+        check_navlevel(descendant, findings)
+
+def check_navlevel(node: NavLevel, findings: Findings) -> None:
+    """
+    Run heuristics on the given navigation level and add what is found to
+    `findings`.
+    """
+    for heuristic in heuristics_for(type(node)):
+        if not heuristic.passes(node):
+            record(findings, heuristic, node.get_path(), node)
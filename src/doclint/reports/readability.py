@@ -1,10 +1,239 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
 
-def sentence_length():
+
+"""
+Report on the readability of the text in the content. Flesch reading ease,
+Flesch-Kincaid grade level and SMOG grade are computed for every navigation
+node with text and aggregated up the navigation tree, so that each level
+gets the scores of all the text below it. The counts of words, sentences
+and syllables are gathered into NumPy arrays and the formulas evaluated for
+all nodes at once.
+
+The text is also checked for sentences and paragraphs that are too long.
+All text is collected first and split into sentences in one batch, see
+`doclint.heuristics.sentence_length`.
+"""
+
+import re
+
+import numpy as np
+
+from rich.console import Console
+from rich.table import Table
+
+from ..structure.content import Text
+from ..structure.findings import Findings, print_findings
+from ..structure.navigation import NavLevel, walk
+from ..heuristics import sentence_length as sentences
+from ..heuristics.engine import record
+
+console = Console(highlight=False, record=True)
+heuristics = [sentences.CheckSentenceLength, sentences.CheckParagraphLength]
+
+# Words as counted for the readability scores.
+WORD = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+
+# Groups of vowels, each roughly one syllable.
+VOWELS = re.compile(r"[aeiouy]+")
+
+# Columns of the counts arrays.
+WORDS, SENTENCES, SYLLABLES, POLYSYLLABLES = range(4)
+
+# The number of syllables of each word counted so far.
+syllable_counts: dict[str, int] = {}
+
+def print_help():
+    print(
+        "Prints readability scores for each navigation level and lists sentences and paragraphs that are too long."
+        " Segments sentences in parallel with --jobs."
+    )
+
+def report(node: NavLevel, output = None, jobs: int = 1) -> Findings:
+    """
+    Print the readability scores for each navigation level with text, the
+    average length of sentences and paragraphs and the text that fails the
+    sentence and paragraph length heuristics. Sentences are segmented by
+    `jobs` processes. Returns the findings.
+    """
+    (nodes, parents, texts, owners) = collect(node)
+    sentences.n_process = jobs
+    lengths = sentences.segment([text.text for text in texts])
+    counts = node_counts(len(nodes), text_counts(texts, lengths), owners)
+    aggregate(counts, parents)
+    print_scores(nodes, counts, scores(counts))
+    console.print(f"average sentence length: {sentence_length(lengths):.1f} words")
+    console.print(f"average paragraph length: {paragraph_length(lengths):.1f} sentences")
+    findings = check_texts([(nodes[owner].get_path(), text) for (owner, text) in zip(owners, texts)])
+    print_findings(findings, console)
+    sentences.clear()
+    if output:
+        html = console.export_html()
+        with open(output, 'w', encoding = 'utf8') as fd:
+            fd.write(html)
+    return findings
+
+def collect(root: NavLevel) -> tuple[list[NavLevel], list[int], list[Text], list[int]]:
+    """
+    Return the navigation nodes from `root` down in document order, the
+    index of each node's parent (-1 for the root), the text in their content
+    and the index of the node each text belongs to.
+    """
+    nodes: list[NavLevel] = []
+    parents: list[int] = []
+    texts: list[Text] = []
+    owners: list[int] = []
+    open_nodes = [-1] # the indexes of the node being visited and its ancestors
+
+    def enter(node: NavLevel) -> None:
+        parents.append(open_nodes[-1])
+        open_nodes.append(len(nodes))
+        nodes.append(node)
+
+    for node in walk(root, pre = enter, post = lambda node: open_nodes.pop()):
+        if node.has_content():
+            for content in node.content():
+                found = content.text()
+                texts += found
+                owners += [open_nodes[-1]] * len(found)
+    return (nodes, parents, texts, owners)
+
+def text_counts(texts: list[Text], lengths: list[list[int]]) -> np.ndarray:
+    """
+    Return an array with a row of counts for each text: words, sentences,
+    syllables and words with three or more syllables.
+    """
+    counts = np.zeros((len(texts), 4), dtype = np.int64)
+    for (row, text) in enumerate(texts):
+        syllables = [syllable_count(word) for word in WORD.findall(text.text)]
+        counts[row, WORDS] = len(syllables)
+        counts[row, SYLLABLES] = sum(syllables)
+        counts[row, POLYSYLLABLES] = sum(1 for count in syllables if count >= 3)
+    counts[:, SENTENCES] = [len(paragraph) for paragraph in lengths]
+    return counts
+
+def syllable_count(word: str) -> int:
+    """
+    Estimate the number of syllables in a word from its groups of vowels.
+    """
+    count = syllable_counts.get(word)
+    if count is None:
+        lower = word.lower()
+        count = len(VOWELS.findall(lower))
+        if lower.endswith('e') and not lower.endswith(('le', 'ee')) and count > 1:
+            count -= 1 # silent e
+        count = max(count, 1)
+        syllable_counts[word] = count
+    return count
+
+def node_counts(size: int, counts: np.ndarray, owners: list[int]) -> np.ndarray:
+    """
+    Return the sum of the counts of the texts of each of `size` nodes.
+    """
+    totals = np.zeros((size, 4), dtype = np.int64)
+    np.add.at(totals, np.asarray(owners, dtype = np.int64), counts)
+    return totals
+
+def aggregate(counts: np.ndarray, parents: list[int]) -> None:
+    """
+    Add the counts of each node to those of its ancestors, one level of the
+    tree at a time from the deepest up, so that each level's totals are
+    complete before they are added to the level above. The nodes are in
+    document order, so every node comes after its parent.
+    """
+    depths = [0] * len(parents)
+    for index in range(1, len(parents)):
+        depths[index] = depths[parents[index]] + 1
+    depth = np.asarray(depths)
+    parent = np.asarray(parents)
+    for level in range(int(depth.max(initial = 0)), 0, -1):
+        rows = np.flatnonzero(depth == level)
+        np.add.at(counts, parent[rows], counts[rows])
+
+def scores(counts: np.ndarray) -> np.ndarray:
+    """
+    Return the Flesch reading ease, Flesch-Kincaid grade level and SMOG grade
+    for each row of counts, NaN where there is no text.
+    """
+    words = counts[:, WORDS].astype(float)
+    sents = counts[:, SENTENCES].astype(float)
+    syllables = counts[:, SYLLABLES].astype(float)
+    polysyllables = counts[:, POLYSYLLABLES].astype(float)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        words_per_sentence = np.where(sents > 0, words / sents, np.nan)
+        syllables_per_word = np.where(words > 0, syllables / words, np.nan)
+        flesch = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+        kincaid = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+        smog = np.where(
+            sents > 0, 1.0430 * np.sqrt(polysyllables * 30 / sents) + 3.1291, np.nan
+        )
+    return np.column_stack((flesch, kincaid, smog))
+
+def print_scores(nodes: list[NavLevel], counts: np.ndarray, results: np.ndarray):
+    """
+    Print a table of the scores of each navigation level that has text.
+    """
+    table = Table(title = 'readability')
+    table.add_column('level')
+    table.add_column('words', justify = 'right')
+    table.add_column('Flesch', justify = 'right')
+    table.add_column('Flesch-Kincaid', justify = 'right')
+    table.add_column('SMOG', justify = 'right')
+    for (node, row, (flesch, kincaid, smog)) in zip(nodes, counts, results):
+        if row[WORDS] == 0:
+            continue
+        table.add_row(
+            '  ' * node.get_depth() + str(node.name),
+            str(row[WORDS]),
+            f"{flesch:.1f}",
+            f"{kincaid:.1f}",
+            f"{smog:.1f}"
+        )
+    console.print(table)
+
+def check_texts(texts: list[tuple[str, Text]]) -> Findings:
+    """
+    Apply the heuristics to all texts and return what is found.
+    """
+    items = [text for (_, text) in texts]
+    columns = [heuristic.cached_passes_batch(items) for heuristic in heuristics]
+    findings = Findings()
+    for (position, (path, text)) in enumerate(texts):
+        for (heuristic, column) in zip(heuristics, columns):
+            if not column[position]:
+                record(findings, heuristic, path, text)
+    return findings
+
+def sentence_length(lengths: list[list[int]]) -> float:
     """
+    Return the average number of words per sentence.
     """
-    pass
+    words = [count for paragraph in lengths for count in paragraph]
+    return sum(words) / len(words) if words else 0.0
 
-def paragraph_length():
+def paragraph_length(lengths: list[list[int]]) -> float:
     """
+    Return the average number of sentences per paragraph.
     """
-    pass
\ No newline at end of file
+    return sum(len(paragraph) for paragraph in lengths) / len(lengths) if lengths else 0.0
@@ -0,0 +1,81 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Report that lists spelling mistakes in the text of the content. All text is
+collected first and its vocabulary looked up in one go, see
+`doclint.heuristics.spelling`.
+"""
+
+from textwrap import shorten
+
+from rich.console import Console
+
+from ..structure.findings import Findings, print_findings
+from ..structure.navigation import NavLevel
+from ..heuristics import spelling
+from ..heuristics.engine import collect_texts
+from ..util.cache import ParseCache
+
+console = Console(highlight=False, record=True)
+
+def print_help():
+    print(
+        "Lists the misspelled words in the text of the course, by navigation path."
+        " Keeps dictionary lookups in the --cache directory between runs."
+    )
+
+def report(node: NavLevel, output = None, cache: ParseCache | None = None) -> Findings:
+    """
+    List every occurrence of a misspelled word under the navigation path it
+    occurs at. If a `cache` is given, the results of dictionary lookups are
+    kept in its directory between runs. Returns the findings.
+    """
+    if cache is not None:
+        spelling.load_words(cache.directory)
+    texts = collect_texts(node)
+    words = spelling.vocabulary(text.text for (_, text) in texts)
+    spelling.check_words(words)
+    findings = Findings()
+    heuristic = spelling.CheckSpelling
+    for (path, text) in texts:
+        for word in spelling.misspelled(text.text):
+            findings.add(
+                heuristic.identifier(),
+                path,
+                f"{word}: {shorten(text.text, 60, placeholder = ' ...')}",
+                heuristic.severity(),
+                heuristic.description()
+            )
+    if cache is not None:
+        spelling.save_words(cache.directory)
+    wrong = sum(1 for word in words if not spelling.known[word])
+    console.print(f"{len(words)} distinct words, {wrong} misspelled")
+    print_findings(findings, console)
+    if output:
+        html = console.export_html()
+        with open(output, 'w', encoding = 'utf8') as fd:
+            fd.write(html)
+    return findings
@@ -30,7 +30,7 @@ from rich.console import Console
 from doclint.structure.content import \
     DiscussionContent, HTMLContent, ProblemContent, UnknownContent, VideoContent
 
-from ..structure.navigation import NavLevel
+from ..structure.navigation import NavLevel, walk
 
 console = Console(highlight= False, record=True)
 
@@ -53,25 +53,37 @@ def report_level(
         numbering: str = ""
     ):
     """
-    Print the ToC line for a specfic navigation level and its children.
+    Print the ToC lines for the levels below a specific navigation level.
+    Levels without a name are left out together with everything below them.
     """
-    _number = 1
-    for child in node.children():
-        if child is None: continue        
-        
-        _numbering = f"{numbering}.{_number}" if numbering != "" else f"{_number}"
+    # The numbering of the level being printed and each of its ancestors,
+    # with the number of children of each that have been printed so far.
+    open_levels = [[numbering, 0]]
+
+    def enter(child: NavLevel):
+        if child is node:
+            return
+        parent = open_levels[-1]
+        parent[1] += 1
+        _numbering = f"{parent[0]}.{parent[1]}" if parent[0] != "" else f"{parent[1]}"
         _content = get_content_logo(child) 
-        _indenting = "  " * indent 
-        if child.name is not None:    
-            if child.include_in_toc():        
-                console.print(f"{_indenting}{_numbering} {child.name}{_content}")
-            _number += 1
-            report_level( 
-                node = child, 
-                indent = indent + 1,
-                numbering = _numbering
-            )
-   
+        _indenting = "  " * (indent + len(open_levels) - 1)
+        if child.include_in_toc():        
+            console.print(f"{_indenting}{_numbering} {child.name}{_content}")
+        open_levels.append([_numbering, 0])
+
+    def leave(child: NavLevel):
+        if child is not node:
+            open_levels.pop()
+
+    for _ in walk(
+        node,
+        prune = lambda child: child is not node and child.name is None,
+        pre = enter,
+        post = leave
+    ):
+        pass
+
 def get_content_logo(node: NavLevel):
     """
     Return a sequence of logos for content in the given navigation node.
@@ -101,4 +113,4 @@ def get_content_logo(node: NavLevel):
     return f" {iconslist}"
 
 def contains_images(html: HTMLContent) -> bool:
-    return html.content.find("img") is not None
\ No newline at end of file
+    return html.has_images()
\ No newline at end of file
@@ -28,10 +28,34 @@ Abstract base class for defining content in the documentation.
 
 from __future__ import annotations
 
+import hashlib
+
 from typing import Any, Sequence
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from bs4 import BeautifulSoup
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer, Tag, UnicodeDammit
+
+from doclint.util.cache import ParseCache
+from doclint.util.imageinfo import inspect_image
+from doclint.util.parsing import parse_html, parse_html_file
+
+# The links, images and text chunks extracted from HTML content.
+Extracted = tuple[list['Link'], list['Image'], list['Text']]
+
+# Elements that start a new chunk of text when extracting text from HTML.
+BLOCK_TAGS = frozenset([
+    'address', 'article', 'aside', 'blockquote', 'body', 'caption', 'dd',
+    'details', 'div', 'dl', 'dt', 'figcaption', 'figure', 'footer', 'form',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav',
+    'ol', 'p', 'pre', 'section', 'summary', 'table', 'td', 'th', 'tr', 'ul',
+])
+
+# Elements whose text is never part of the content.
+SKIP_TAGS = frozenset(['head', 'noscript', 'script', 'style', 'template'])
+
+# Attributes that BeautifulSoup splits into lists of values.
+MULTI_VALUED_ATTRS = frozenset(['accesskey', 'class', 'dropzone', 'rel', 'rev'])
 
 
 @dataclass
@@ -57,71 +81,531 @@ class Content(ABC):
 @dataclass
 class HTMLContent(Content):
     """
-    HTML content parsed by BeautifulSoup.
+    HTML content parsed by BeautifulSoup. Either the parsed `content` is
+    given or a `source` file that is parsed the first time the content is
+    needed. With `keep_parsed` set to False, the parsed tree is dropped again
+    after each use so that only the file reference stays in memory.
+
+    The `source` can be a `Path` or anything else with a `read_bytes()`
+    method, such as an `ArchivePath`. If a `region` is given, only the first
+    element with that tag name is used, for example the `article` that holds
+    the content of a page generated by MkDocs. The whole document is used if
+    there is no such element.
+
+    Links, images and text are extracted from the tree once and kept in
+    `extracted`. If that is given when the object is created, for example
+    from a cache, the HTML is not parsed at all to answer `links()`,
+    `images()` or `text()`. The `digest` of the source, if known, identifies
+    byte-identical content, which can then share one `extracted` tuple.
+    Content that is parsed lazily and was not found in the `cache` it was
+    read with keeps a reference to the cache and adds what it extracts to
+    it the first time it is parsed.
+
+    The `assets` and `targets`, if given by the datatype, resolve the files
+    that images refer to and the targets of internal links, see `images()`
+    and `links()`. What they resolve to depends on where the content is, so
+    it is kept in `resolved` for this content only, never in the `extracted`
+    items, which may be shared with copies of the content elsewhere.
     """
 
-    content: BeautifulSoup
+    content: BeautifulSoup | None = None
+    source: Path | None = None
+    keep_parsed: bool = True
+    region: str | None = None
+    digest: str | None = None
+    extracted: Extracted | None = field(default = None, repr = False, compare = False)
+    assets: Any = field(default = None, repr = False, compare = False)
+    targets: Any = field(default = None, repr = False, compare = False)
+    resolved: dict[str, list] = field(default_factory = dict, repr = False, compare = False)
+    cache: ParseCache | None = field(default = None, repr = False, compare = False)
+
+    def soup(self, data: bytes | None = None) -> BeautifulSoup:
+        """
+        Return the parsed content, parsing the `source` file if necessary.
+        The bytes of the source can be passed in as `data` if they have
+        already been read.
+        """
+        if self.content is None:
+            if self.source is None:
+                raise ValueError("HTMLContent has neither content nor source")
+            html = data if data is not None else self.source.read_bytes()
+            if self.region is not None:
+                self.content = BeautifulSoup(
+                    html,
+                    features='lxml',
+                    from_encoding='utf-8',
+                    parse_only=SoupStrainer(self.region)
+                )
+                if self.content.find(self.region) is not None:
+                    return self.content
+            self.content = BeautifulSoup(html, features='lxml', from_encoding='utf-8')
+        return self.content
+
+    def release(self) -> None:
+        """
+        Drop the parsed tree if it can be parsed again from the `source` file.
+        """
+        if self.source is not None:
+            self.content = None
+
+    def extract(self, data: bytes | None = None) -> Extracted:
+        """
+        Return the links, images and text in the content, extracting them
+        from the parsed tree if this has not been done yet. `data` is passed
+        on to `soup()`.
+        """
+        if self.extracted is None:
+            soup = self.soup(data)
+            self.extracted = (
+                extract_bs4_links(soup),
+                extract_bs4_images(soup),
+                extract_bs4_text(soup)
+            )
+            self.store()
+            if not self.keep_parsed:
+                self.release()
+        return self.extracted
+
+    def store(self) -> None:
+        """
+        Add what was extracted to the `cache`, if there is one. This is only
+        done once, the reference to the cache is dropped afterwards.
+        """
+        if self.cache is not None and self.source is not None:
+            self.cache.put(self.source, cache_kind(self.region), (self.digest, self.extracted))
+        self.cache = None
 
     def links(self) -> Sequence[Link]:
-        links = []
-        for link in self.content.find_all('a', recursive = True):
+        """
+        Return the links in the content. If the content has `targets`, an
+        object with `is_internal(url)` and `resolve(url)` methods provided by
+        the datatype, links to other parts of the documentation are marked
+        as `internal` and their `target` is set to what they go to, if that
+        exists.
+        """
+        links = self.extract()[0]
+        if self.targets is None:
+            return links
+        if 'links' not in self.resolved:
+            self.resolved['links'] = [
+                replace(link, internal = True, target = self.targets.resolve(link.url))
+                    if self.targets.is_internal(link.url) else link
+                    for link in links
+            ]
+        return self.resolved['links']
+
+    def images(self) -> Sequence[Image]:
+        """
+        Return the images in the content. If the content has `assets`, an
+        object with a `resolve(src)` method provided by the datatype, the
+        `file` of each image is set to the file its `src` refers to.
+        """
+        images = self.extract()[1]
+        if self.assets is None:
+            return images
+        if 'images' not in self.resolved:
+            self.resolved['images'] = [
+                replace(image, file = self.assets.resolve(image.src)) for image in images
+            ]
+        return self.resolved['images']
+
+    def has_images(self) -> bool:
+        """
+        Returns True if there is at least one image in the content.
+        """
+        return len(self.extract()[1]) > 0
+
+    def text(self) -> list[Text]:
+        return self.extract()[2]
+
+    def plain_text(self) -> str:
+        """
+        Return the text of the whole content, its chunks joined by newlines.
+        The offsets of each `Text` chunk refer to this.
+        """
+        return '\n'.join(chunk.text for chunk in self.text())
+
+    def parse(self, data: bytes | None = None) -> None:
+        """
+        Parse the content and extract its items now instead of on first use,
+        from the `data` given or else from the `source` file.
+        """
+        self.extract(data)
+
+
+@dataclass
+class LxmlHTMLContent(HTMLContent):
+    """
+    HTML content parsed directly with lxml instead of BeautifulSoup. Links,
+    images and text are extracted in a single pass over the tree the first
+    time any of them is needed. Only the extracted items are kept, never the
+    tree, so `content` is always None.
+    """
+
+    def soup(self, data: bytes | None = None) -> BeautifulSoup:
+        """
+        Return the content parsed by BeautifulSoup, for code that needs the
+        whole tree. It is parsed again on every call and not kept, as the
+        links, images and text do not need it.
+        """
+        soup = super().soup(data)
+        self.content = None
+        return soup
+
+    def extract(self, data: bytes | None = None) -> Extracted:
+        """
+        Return the links, images and text in the content, parsing it if this
+        has not been done yet. Content is parsed as UTF-8 first. If it is not
+        valid UTF-8, it is decoded the way BeautifulSoup does it, using the
+        encoding declared in the file or else a guess, and parsed again.
+        """
+        if self.extracted is None:
+            if self.source is None:
+                raise ValueError("LxmlHTMLContent has no source")
+            try:
+                root = parse_html(data) if data is not None else parse_html_file(self.source)
+                self.extracted = extract_lxml(self.region_of(root))
+            except UnicodeDecodeError:
+                html = data if data is not None else self.source.read_bytes()
+                markup = UnicodeDammit(html, ['utf-8'], is_html = True).unicode_markup
+                self.extracted = extract_lxml(self.region_of(parse_html(markup)))
+            self.store()
+        return self.extracted
+
+    def region_of(self, root):
+        """
+        Return the first element in `root` with the tag of the `region`, if
+        there is a region and such an element, `root` otherwise.
+        """
+        if self.region is not None and root is not None:
+            region = next(root.iter(self.region), None)
+            if region is not None:
+                return region
+        return root
+
+
+# Content classes for HTML by the name of the engine used to parse it.
+HTML_ENGINES: dict[str, type[HTMLContent]] = {
+    'bs4': HTMLContent,
+    'lxml': LxmlHTMLContent,
+}
+
+
+@dataclass(frozen = True)
+class ReadOptions:
+    """
+    Options that control how datatypes read content: the `engine` used to
+    parse HTML (a key of `HTML_ENGINES`), whether HTML is parsed `lazy`ily
+    on first use instead of when it is read and the `cache` for data
+    extracted from files, if any.
+
+    If `shared` is given, HTML files are hashed when they are read and
+    byte-identical files are parsed only once, sharing the extracted links,
+    images and text through this dictionary, which maps digests to them.
+    Lazy content is only shared if it was found in the cache.
+    """
+    engine: str = 'bs4'
+    lazy: bool = False
+    cache: ParseCache | None = None
+    shared: dict[str, Extracted] | None = None
+
+    def read_html(
+        self,
+        source: Path,
+        parent: Any,
+        region: str | None = None,
+        assets: Any = None,
+        targets: Any = None
+        ) -> HTMLContent:
+        """
+        Create the HTML content for a `source` file according to the options,
+        restricted to the `region` given, if any, with the `assets` that its
+        images are resolved against and the `targets` that its internal links
+        are resolved against. Content found in the cache is never
+        parsed. Lazy content that is not in the cache is added to it when it
+        is first parsed.
+        """
+        kind = cache_kind(region)
+        cached = self.cache.get(source, kind) if self.cache is not None else None
+        (digest, extracted) = cached if cached is not None else (None, None)
+
+        data = None
+        if extracted is None and self.shared is not None and not self.lazy:
+            data = source.read_bytes()
+            digest = content_digest(data)
+            extracted = self.shared.get(digest)
+
+        html = HTML_ENGINES[self.engine](
+            source = source,
+            parent = parent,
+            keep_parsed = not self.lazy,
+            region = region,
+            digest = digest,
+            extracted = extracted,
+            assets = assets,
+            targets = targets,
+            cache = self.cache if extracted is None and self.lazy else None
+        )
+        if extracted is None and not self.lazy:
+            html.parse(data)
+            if self.cache is not None:
+                self.cache.put(source, kind, (digest, html.extracted))
+        if self.shared is not None and digest is not None and html.extracted is not None:
+            html.extracted = self.shared.setdefault(digest, html.extracted)
+        return html
+
+
+def cache_kind(region: str | None) -> str:
+    """
+    Return the kind of data that HTML content restricted to `region`, if
+    given, is cached as.
+    """
+    return f'html:{region}' if region is not None else 'html'
+
+
+def content_digest(data: bytes) -> str:
+    """
+    Return the digest that identifies content with the bytes `data`.
+    """
+    return hashlib.sha1(data).hexdigest()
+
+
+def extract_bs4_links(soup: BeautifulSoup) -> list[Link]:
+    """
+    Return the links in a BeautifulSoup tree.
+    """
+    links = []
+    for link in soup.find_all('a', recursive = True):
+        links.append(Link(
+            text = link.get_text(),
+            url = link.get('href'),
+            attrs = link.attrs
+        ))
+    return links
+
+
+def extract_bs4_images(soup: BeautifulSoup) -> list[Image]:
+    """
+    Return the images in a BeautifulSoup tree.
+    """
+    images = []
+    for image in soup.find_all('img', recursive = True):
+        images.append(Image(
+            src = image.get('src'),
+            alt_text = image.get('alt') 
+        ))
+    return images
+
+
+def extract_bs4_text(soup: BeautifulSoup) -> list[Text]:
+    """
+    Return the chunks of text in a BeautifulSoup tree.
+    """
+    collector = TextCollector()
+    stack: list = [soup]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, TextCollector.End):
+            if node.tag in BLOCK_TAGS:
+                collector.flush()
+            collector.close()
+        elif isinstance(node, Tag):
+            if node.name in SKIP_TAGS:
+                continue
+            if node.name in BLOCK_TAGS:
+                collector.flush()
+            if isinstance(node, BeautifulSoup): # the document, not an element
+                stack.extend(reversed(node.contents))
+                continue
+            collector.open(node.name)
+            stack.append(TextCollector.End(node.name))
+            stack.extend(reversed(node.contents))
+        elif type(node) in (NavigableString, CData):
+            collector.add(str(node))
+    return collector.finish()
+
+
+def extract_lxml(root) -> Extracted:
+    """
+    Walk an lxml HTML tree once, collecting links, images and text chunks.
+    `root` may be None, which lxml returns for empty documents.
+    """
+    links: list[Link] = []
+    images: list[Image] = []
+    collector = TextCollector()
+    stack: list = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        if isinstance(node, TextCollector.End):
+            if node.tag in BLOCK_TAGS:
+                collector.flush()
+            collector.close()
+            collector.add(node.tail)
+            continue
+        if not isinstance(node.tag, str): # comments, processing instructions
+            collector.add(node.tail)
+            continue
+        if node.tag in SKIP_TAGS:
+            collector.add(node.tail)
+            continue
+        if node.tag == 'a':
             links.append(Link(
-                text = link.get_text(),
-                url = link.get('href'),
-                attrs = link.attrs
+                text = ''.join(node.itertext()),
+                url = node.get('href'),
+                attrs = bs4_attrs(node)
             ))
-        return links
-    
-    def images(self) -> Sequence[Image]:
-        images = []
-        for image in self.content.find_all('img', recursive = True):
+        elif node.tag == 'img':
             images.append(Image(
-                src = image.get('src'),
-                alt_text = image.get('alt') 
+                src = node.get('src'),
+                alt_text = node.get('alt')
             ))
-        return images
+        if node.tag in BLOCK_TAGS:
+            collector.flush()
+        collector.open(node.tag)
+        collector.add(node.text)
+        stack.append(TextCollector.End(node.tag, node.tail))
+        stack.extend(reversed(node))
+    return (links, images, collector.finish())
 
-    def text(self) -> list[Text]:
-        return [] # TODO
+
+def bs4_attrs(element) -> dict:
+    """
+    Return the attributes of an lxml element the way BeautifulSoup represents
+    them, with multi-valued attributes such as `class` split into lists.
+    """
+    return {
+        name: value.split() if name in MULTI_VALUED_ATTRS else value
+            for (name, value) in element.attrib.items()
+    }
+
+
+class TextCollector:
+    """
+    Collects text in document order and splits it into `Text` chunks at the
+    boundaries of block-level elements. Whitespace is normalised and empty
+    chunks are dropped.
+
+    Walkers call `open()` and `close()` for each element so that every chunk
+    can be given the path of the elements it was found in. Each chunk's
+    offsets are those of its text in the chunks joined by newlines, see
+    `Text`.
+    """
+
+    @dataclass
+    class End:
+        """
+        Marker pushed onto a walker's stack for the end of an element.
+        """
+        tag: str
+        tail: str | None = None
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+        self.chunks: list[Text] = []
+        self.elements: list[str] = []
+        self.offset = 0
+
+    def open(self, tag: str) -> None:
+        """
+        Note the start of an element.
+        """
+        self.elements.append(tag)
+
+    def close(self) -> None:
+        """
+        Note the end of the innermost open element.
+        """
+        if self.elements:
+            self.elements.pop()
+
+    def add(self, text: str | None) -> None:
+        """
+        Add a piece of text to the current chunk.
+        """
+        if text:
+            self.parts.append(text)
+
+    def flush(self) -> None:
+        """
+        End the current chunk.
+        """
+        text = ' '.join(''.join(self.parts).split())
+        self.parts = []
+        if text:
+            start = self.offset
+            self.offset = start + len(text) + 1
+            self.chunks.append(Text(
+                text = text,
+                start = start,
+                end = start + len(text),
+                path = '/'.join(self.elements)
+            ))
+
+    def finish(self) -> list[Text]:
+        """
+        End the current chunk and return all chunks collected.
+        """
+        self.flush()
+        return self.chunks
 
 
 @dataclass
 class Link:
     """
-    A link with the URL, link text and any attributes.
+    A link with the URL, link text and any attributes. Links to other parts
+    of the documentation are `internal`, with an identifier of the `target`
+    they go to, if it could be found, see `HTMLContent.links()`. Anchors
+    without an `href`, such as `<a name="x">`, have None as their URL.
     """
     text: str
-    url: str
+    url: str | None
     attrs: dict[str, str]
+    internal: bool = field(default = False, compare = False)
+    target: Any = field(default = None, repr = False, compare = False)
 
 
 @dataclass
 class Image:
     """
-    An image.
+    An image. The `file` is the image file that the `src` refers to, if it
+    is part of the documentation and could be found, see
+    `HTMLContent.images()`.
     """
     src: str
     alt_text: str
+    file: Any = field(default = None, repr = False, compare = False)
 
-    def get_dimensions():
+    def get_dimensions(self) -> tuple[int, int] | None:
         """
-        Get the width and height in pixels.
+        Get the width and height in pixels, None if they are not known.
         """
-        pass
+        info = inspect_image(self.file) if self.file is not None else None
+        if info is None or info.width is None:
+            return None
+        return (info.width, info.height)
 
-    def get_size():
+    def get_size(self) -> float | None:
         """
-        Get the size in Megabytes.
+        Get the size in Megabytes, None if it is not known.
         """
-        pass
+        info = inspect_image(self.file) if self.file is not None else None
+        return info.size / (1024 * 1024) if info is not None else None
 
 @dataclass
 class Text:
     """
     A chunk of text in the content. Could be anyting from a single letter to
     a paragraph or even a whole text.
+
+    The `start` and `end` offsets locate the chunk in the text of the whole
+    content, which is all its chunks joined by newlines, see
+    `HTMLContent.plain_text()`. The `path` lists the elements the chunk was
+    found in, such as `body/div/p`.
     """
     text: str
+    start: int = 0
+    end: int = 0
+    path: str = ''
 
 @dataclass
 class VideoContent(Content):
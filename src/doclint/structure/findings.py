@@ -0,0 +1,244 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+A compact store for the findings of heuristics. Each finding is one row in a
+set of parallel columns: the heuristic, the path of the navigation node, the
+location of the item in its content and a severity. Heuristics and paths are
+interned so that each row only takes a few bytes plus its location, and the
+columns can be counted, filtered and sorted without running the heuristics
+again.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from enum import IntEnum
+from textwrap import shorten
+from typing import Any, Iterator, NamedTuple
+
+from rich.console import Console
+
+from doclint.structure.content import Image, Link, Text
+from doclint.structure.navigation import NavLevel
+
+
+class Severity(IntEnum):
+    """
+    How serious a finding is.
+    """
+    INFO = 0
+    WARNING = 1
+    ERROR = 2
+
+
+class Finding(NamedTuple):
+    """
+    A single finding, as read back from a `Findings` store.
+    """
+    heuristic: str
+    path: str
+    location: str
+    severity: Severity
+
+
+class Findings:
+    """
+    Findings kept in parallel columns. The `heuristic` and `path` columns
+    hold indexes into tables of interned heuristic identifiers and navigation
+    paths, `severity` holds a `Severity` per finding and `location` the text
+    that locates the item, such as the URL of a link.
+    """
+
+    COLUMNS = ('heuristic', 'path', 'location', 'severity')
+
+    def __init__(self) -> None:
+        self.heuristics: list[str] = []
+        self.heuristic_index: dict[str, int] = {}
+        self.descriptions: dict[str, str] = {}
+        self.paths: list[str] = []
+        self.path_index: dict[str, int] = {}
+        self.heuristic_column = array('H')
+        self.path_column = array('I')
+        self.location_column: list[str] = []
+        self.severity_column = array('B')
+
+    def add(
+        self,
+        heuristic: str,
+        path: str,
+        location: str,
+        severity: Severity = Severity.ERROR,
+        description: str | None = None
+        ) -> None:
+        """
+        Add a finding. The `description` of the heuristic only needs to be
+        given once per heuristic.
+        """
+        index = self.heuristic_index.get(heuristic)
+        if index is None:
+            index = len(self.heuristics)
+            self.heuristics.append(heuristic)
+            self.heuristic_index[heuristic] = index
+            self.descriptions[heuristic] = description or ''
+        self.heuristic_column.append(index)
+        self.path_column.append(self.intern(path))
+        self.location_column.append(location)
+        self.severity_column.append(severity)
+
+    def extend(self, other: Findings) -> None:
+        """
+        Append the findings in `other` to this store.
+        """
+        for finding in other:
+            self.add(*finding, description = other.descriptions[finding.heuristic])
+
+    def intern(self, path: str) -> int:
+        """
+        Return the index of `path` in the table of paths, adding it if it is
+        not there yet.
+        """
+        index = self.path_index.get(path)
+        if index is None:
+            index = len(self.paths)
+            self.paths.append(path)
+            self.path_index[path] = index
+        return index
+
+    def __len__(self) -> int:
+        return len(self.location_column)
+
+    def __getitem__(self, row: int) -> Finding:
+        return Finding(
+            self.heuristics[self.heuristic_column[row]],
+            self.paths[self.path_column[row]],
+            self.location_column[row],
+            Severity(self.severity_column[row])
+        )
+
+    def __iter__(self) -> Iterator[Finding]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def column(self, name: str) -> list[Any]:
+        """
+        Return the values of the column with the given `name` for all rows,
+        with interned values looked up.
+        """
+        if name == 'heuristic':
+            return [self.heuristics[index] for index in self.heuristic_column]
+        if name == 'path':
+            return [self.paths[index] for index in self.path_column]
+        if name == 'location':
+            return list(self.location_column)
+        if name == 'severity':
+            return [Severity(value) for value in self.severity_column]
+        raise KeyError(name)
+
+    def count_by(self, name: str) -> dict[Any, int]:
+        """
+        Return the number of findings for each value of a column. Interned
+        columns are counted by index before the values are looked up.
+        """
+        if name == 'heuristic':
+            counts = Counter(self.heuristic_column)
+            return {self.heuristics[index]: count for (index, count) in counts.items()}
+        if name == 'path':
+            counts = Counter(self.path_column)
+            return {self.paths[index]: count for (index, count) in counts.items()}
+        return dict(Counter(self.column(name)))
+
+    def select(self, rows) -> Findings:
+        """
+        Return a new store with the given `rows`, in the order given.
+        """
+        selected = Findings()
+        for row in rows:
+            finding = self[row]
+            selected.add(*finding, description = self.descriptions[finding.heuristic])
+        return selected
+
+    def filter(
+        self,
+        heuristic: str | None = None,
+        min_severity: Severity = Severity.INFO
+        ) -> Findings:
+        """
+        Return the findings for the given `heuristic`, if any, with at least
+        the given severity.
+        """
+        wanted = self.heuristic_index.get(heuristic) if heuristic is not None else None
+        if heuristic is not None and wanted is None:
+            return Findings()
+        return self.select(
+            row for row in range(len(self))
+                if (wanted is None or self.heuristic_column[row] == wanted)
+                and self.severity_column[row] >= min_severity
+        )
+
+    def sorted(self, *names: str, reverse: bool = False) -> Findings:
+        """
+        Return the findings sorted by the given columns. Rows that are equal
+        in all of them keep their order, which is document order for findings
+        added while walking the navigation structure.
+        """
+        columns = [self.column(name) for name in names]
+        rows = sorted(
+            range(len(self)),
+            key = lambda row: tuple(column[row] for column in columns),
+            reverse = reverse
+        )
+        return self.select(rows)
+
+
+def item_location(item: Any) -> str:
+    """
+    Return the text that locates an item a heuristic was applied to.
+    """
+    if isinstance(item, Link):
+        return f"{item.text} -> {item.url}"
+    if isinstance(item, Image):
+        return item.src
+    if isinstance(item, Text):
+        return shorten(item.text, 60, placeholder = ' ...')
+    if isinstance(item, NavLevel):
+        return str(item.name)
+    return str(item)
+
+
+def print_findings(findings: Findings, console: Console) -> None:
+    """
+    Print the findings to a `rich` console, grouped under the navigation
+    path they were found at.
+    """
+    current = None
+    for finding in findings:
+        if finding.path != current:
+            current = finding.path
+            console.print(f"[magenta]{current}[/magenta]")
+        console.print(f"❌ {finding.location}")
+        description = findings.descriptions[finding.heuristic]
+        console.print(f"   [red]{finding.heuristic}: {description}[/red]")
@@ -25,12 +25,15 @@
 """
 Abstract base class for representation of a hierarchical navigation structure.
 Supports navigation up and down the hierarchy but not between siblings.
+Reports walk the structure with `walk()` and the content in it with
+`contents()`, which do not recurse and so work for trees of any depth.
 """
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Sequence
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Sequence
 from doclint.structure.content import Content
 
 @dataclass(kw_only=True)
@@ -44,9 +47,14 @@ class NavLevel(ABC):
     Each navigation node can have content attached. In some systems, content
     only ever appears in leaf nodes, in which case the content lists higher
     up in the tree will simply be empty.
+
+    If the node is part of a `NavTree`, that is its `tree` and `position`
+    in it, and its depth and path are looked up there.
     """
     name: str | None         # human-readable name
     parent: NavLevel | None  # None if root of the hierarchy
+    tree: NavTree | None = field(default = None, repr = False, compare = False)
+    position: int = field(default = -1, repr = False, compare = False)
 
     @abstractmethod
     def is_root(self) -> bool:
@@ -88,15 +96,163 @@ class NavLevel(ABC):
         """
         return True
 
+    def close(self) -> None:
+        """
+        Release anything held open to read this navigation level and its
+        children from, such as an archive. Does nothing by default, override
+        where a loader keeps resources open.
+        """
+
     def get_depth(self) -> int:
         """
         Return the depth of navigation that this node sits at.
         """
-        return 1 + self.parent.get_depth() if self.parent is not None else 0
+        if self.tree is not None:
+            return self.tree.depth[self.position]
+        depth = 0
+        node = self.parent
+        while node is not None:
+            depth += 1
+            node = node.parent
+        return depth
+
+    def get_path(self) -> str:
+        """
+        Return the path to this navigation node, the names of the nodes from
+        the root down to it, each preceded by a slash.
+        """
+        if self.tree is not None:
+            return self.tree.path(self.position)
+        names = []
+        node = self
+        while node is not None:
+            names.append(str(node.name))
+            node = node.parent
+        return "/" + "/".join(reversed(names))
+
+
+class NavTree:
+    """
+    A compact copy of the shape of a navigation tree, built once after the
+    tree has been read. Nodes are numbered breadth-first, so the children of
+    each node have consecutive numbers. For each node, parallel arrays hold
+    the number of its parent (-1 for the root), its depth, the number of its
+    first child and how many children it has, and the index of its path in
+    a table of interned paths.
+
+    Building the tree sets the `tree` and `position` of every node in it, so
+    that `NavLevel.get_depth()` and `NavLevel.get_path()` are lookups rather
+    than walks up the parent chain. Build a new one if the tree changes.
+    """
+
+    def __init__(self, root: NavLevel) -> None:
+        self.nodes: list[NavLevel] = [root]
+        self.parent = array('i', [-1])
+        self.depth = array('H', [0])
+        self.first_child = array('I')
+        self.child_count = array('I')
+        self.paths: list[str] = []
+        self.path_index: dict[str, int] = {}
+        self.path_column = array('I')
+
+        position = 0
+        while position < len(self.nodes):
+            node = self.nodes[position]
+            children = [child for child in node.children() if child is not None] \
+                if node.has_children() else []
+            self.first_child.append(len(self.nodes))
+            self.child_count.append(len(children))
+            for child in children:
+                self.nodes.append(child)
+                self.parent.append(position)
+                self.depth.append(self.depth[position] + 1)
+            parent = self.parent[position]
+            prefix = self.path(parent) if parent >= 0 else ""
+            self.path_column.append(self.intern(prefix + "/" + str(node.name)))
+            node.tree = self
+            node.position = position
+            position += 1
+
+    def intern(self, path: str) -> int:
+        """
+        Return the index of `path` in the table of paths, adding it if it is
+        not there yet.
+        """
+        index = self.path_index.get(path)
+        if index is None:
+            index = len(self.paths)
+            self.paths.append(path)
+            self.path_index[path] = index
+        return index
+
+    def path(self, position: int) -> str:
+        """
+        Return the path of the node with the given number.
+        """
+        return self.paths[self.path_column[position]]
 
-    def get_path(self):
+    def children(self, position: int) -> list[NavLevel]:
         """
-        Print the path to this navigation node.
+        Return the children of the node with the given number.
         """
-        parent_path = self.parent.get_path() if self.parent is not None else ""
-        return parent_path + "/" + str(self.name)
\ No newline at end of file
+        first = self.first_child[position]
+        return self.nodes[first:first + self.child_count[position]]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+def walk(
+    root: NavLevel,
+    types: type | tuple[type, ...] | None = None,
+    *,
+    prune: Callable[[NavLevel], bool] | None = None,
+    pre: Callable[[NavLevel], None] | None = None,
+    post: Callable[[NavLevel], None] | None = None
+    ) -> Iterator[NavLevel]:
+    """
+    Yield `root` and every node below it in document order, each node before
+    its children. Nodes for which `prune` returns True are skipped together
+    with everything below them. If `types` are given, only nodes of these
+    types are yielded, the others are still walked through.
+
+    The `pre` hook is called for each node yielded just before it is yielded,
+    the `post` hook once all nodes below it have been yielded, so both are
+    only called as far as the walk is consumed.
+    """
+    stack: list[tuple[NavLevel, bool]] = [(root, False)]
+    while stack:
+        (node, done) = stack.pop()
+        if done:
+            post(node)
+            continue
+        if prune is not None and prune(node):
+            continue
+        if types is None or isinstance(node, types):
+            if post is not None:
+                stack.append((node, True))
+            if pre is not None:
+                pre(node)
+            yield node
+        if node.has_children():
+            stack.extend(
+                (child, False) for child in reversed(node.children()) if child is not None
+            )
+
+
+def contents(
+    root: NavLevel,
+    types: type | tuple[type, ...] | None = None,
+    *,
+    prune: Callable[[NavLevel], bool] | None = None
+    ) -> Iterator[tuple[NavLevel, Content]]:
+    """
+    Yield the content of `root` and everything below it in document order,
+    each with the navigation node it belongs to. If `types` are given, only
+    content of these types is yielded. Subtrees are skipped as for `walk()`.
+    """
+    for node in walk(root, prune = prune):
+        if node.has_content():
+            for content in node.content():
+                if types is None or isinstance(content, types):
+                    yield (node, content)
@@ -0,0 +1,259 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+"""
+Read documentation straight from a (compressed) tar archive without
+extracting it to disk. An `ArchivePath` behaves like the subset of
+`pathlib.Path` that datatypes use to read files, so a datatype can be handed
+either a directory or the root of an archive.
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+import os
+import posixpath
+import shutil
+import tarfile
+import tempfile
+import threading
+
+from dataclasses import dataclass
+from pathlib import Path
+
+ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+# Archives up to this size are decompressed into memory, larger ones into a
+# temporary file.
+SPOOL_MAX_BYTES = 256 * 1024 * 1024
+
+
+def is_archive(path: Path) -> bool:
+    """
+    Returns True if `path` is a file that looks like a tar archive.
+    """
+    return path.is_file() and path.name.endswith(ARCHIVE_SUFFIXES)
+
+
+@dataclass(frozen = True)
+class ArchiveStat:
+    """
+    The parts of `os.stat_result` that are available for archive members.
+    """
+    st_mtime_ns: int
+    st_size: int
+
+
+class CourseArchive:
+    """
+    A tar archive whose members can be read in any order. An uncompressed
+    archive is read in place. A compressed one is decompressed once, in a
+    single pass, into a spooled temporary file, which stays in memory up to
+    `SPOOL_MAX_BYTES` and is written to a temporary file on disk beyond
+    that. An index of the members is built while reading the archive, so
+    reading a member is then a single read at its offset.
+
+    Where the data is in a file, members are read with `os.pread()`, which
+    does not move the file position. Processes forked while the archive is
+    open share that position, so reads that seek could read the wrong
+    bytes when forked workers parse lazy content. Data held in memory is
+    read with a seek and a read, serialised with a lock so that the archive
+    can be shared between threads.
+
+    The archive should be closed with `close()`, or used as a context
+    manager, once nothing needs to read from it any more.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path).absolute()
+        self.lock = threading.Lock()
+        if compression(self.path) is None:
+            self.data = open(self.path, 'rb')
+            on_disk = True
+        else:
+            self.data = tempfile.SpooledTemporaryFile(max_size = SPOOL_MAX_BYTES)
+            with open_decompressed(self.path) as compressed:
+                shutil.copyfileobj(compressed, self.data, 1024 * 1024)
+            on_disk = self.data.tell() > SPOOL_MAX_BYTES # rolled over to a file
+            self.data.seek(0)
+        self.fd = self.data.fileno() if on_disk and hasattr(os, 'pread') else None
+        with tarfile.open(fileobj = self.data, mode = 'r:') as tar:
+            self.members: dict[str, tarfile.TarInfo] = {
+                posixpath.normpath(info.name): info
+                    for info in tar
+                    if info.isfile()
+            }
+
+    def close(self) -> None:
+        """
+        Close the archive and remove the temporary file, if there is one.
+        """
+        with self.lock:
+            self.data.close()
+
+    def __enter__(self) -> CourseArchive:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def read(self, name: str, limit: int | None = None) -> bytes:
+        """
+        Return the content of the member with the given `name`, only the
+        first `limit` bytes if a limit is given.
+        """
+        info = self.member(name)
+        size = info.size if limit is None else min(limit, info.size)
+        if self.fd is not None:
+            return os.pread(self.fd, size, info.offset_data)
+        with self.lock:
+            self.data.seek(info.offset_data)
+            return self.data.read(size)
+
+    def member(self, name: str) -> tarfile.TarInfo:
+        """
+        Return the index entry for a member, raising `FileNotFoundError` if
+        there is no such member.
+        """
+        try:
+            return self.members[name]
+        except KeyError as error:
+            raise FileNotFoundError(f"{self.path}!/{name}") from error
+
+    def root(self, marker: str) -> ArchivePath:
+        """
+        Return the directory in the archive that contains the file named
+        `marker`, for example `course.xml`, closest to the top of the archive.
+        Exports usually wrap their content in a single top-level directory.
+        """
+        candidates = [
+            name for name in self.members
+                if posixpath.basename(name) == marker
+        ]
+        if not candidates:
+            raise FileNotFoundError(f"{self.path}!/**/{marker}")
+        best = min(candidates, key = lambda name: name.count('/'))
+        return ArchivePath(self, posixpath.dirname(best))
+
+
+class ArchivePath:
+    """
+    A file or directory inside a `CourseArchive`, supporting the parts of the
+    `pathlib.Path` interface needed to read files.
+    """
+
+    def __init__(self, archive: CourseArchive, name: str) -> None:
+        self.archive = archive
+        self.name_in_archive = name
+
+    @property
+    def name(self) -> str:
+        return posixpath.basename(self.name_in_archive)
+
+    @property
+    def stem(self) -> str:
+        return posixpath.splitext(self.name)[0]
+
+    def joinpath(self, *parts: str) -> ArchivePath:
+        return ArchivePath(
+            self.archive,
+            posixpath.normpath(posixpath.join(self.name_in_archive, *parts))
+        )
+
+    def exists(self) -> bool:
+        return self.name_in_archive in self.archive.members
+
+    def read_bytes(self) -> bytes:
+        return self.archive.read(self.name_in_archive)
+
+    def read_head(self, size: int) -> bytes:
+        """
+        Return up to `size` bytes from the start of the file.
+        """
+        return self.archive.read(self.name_in_archive, size)
+
+    def read_text(self, encoding: str = 'utf-8') -> str:
+        return self.read_bytes().decode(encoding)
+
+    def stat(self) -> ArchiveStat:
+        info = self.archive.member(self.name_in_archive)
+        return ArchiveStat(st_mtime_ns = int(info.mtime * 1e9), st_size = info.size)
+
+    def position(self) -> int:
+        """
+        Return the offset of the member in the archive, -1 if it does not
+        exist.
+        """
+        info = self.archive.members.get(self.name_in_archive)
+        return info.offset_data if info is not None else -1
+
+    def absolute(self) -> ArchivePath:
+        return self
+
+    def __str__(self) -> str:
+        return f"{self.archive.path}!/{self.name_in_archive}"
+
+    def __repr__(self) -> str:
+        return f"ArchivePath('{self}')"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ArchivePath) \
+            and other.archive is self.archive \
+            and other.name_in_archive == self.name_in_archive
+
+    def __hash__(self) -> int:
+        return hash((id(self.archive), self.name_in_archive))
+
+
+def compression(path: Path) -> str | None:
+    """
+    Return the compression of a file from the magic bytes it starts with:
+    'gzip', 'bzip2' or 'xz', None if it is not compressed.
+    """
+    with open(path, 'rb') as fd:
+        magic = fd.read(6)
+    if magic.startswith(b'\x1f\x8b'):
+        return 'gzip'
+    if magic.startswith(b'BZh'):
+        return 'bzip2'
+    if magic.startswith(b'\xfd7zXZ\x00'):
+        return 'xz'
+    return None
+
+
+def open_decompressed(path: Path):
+    """
+    Open a file for reading, decompressing it on the fly if it is compressed
+    with gzip, bzip2 or xz.
+    """
+    match compression(path):
+        case 'gzip':
+            return gzip.open(path, 'rb')
+        case 'bzip2':
+            return bz2.open(path, 'rb')
+        case 'xz':
+            return lzma.open(path, 'rb')
+    return open(path, 'rb')
@@ -0,0 +1,137 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Support for running doclint over many courses in one process: finding the
+courses to check and summarising the results.
+"""
+
+from __future__ import annotations
+
+import glob
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from doclint.util.archive import ARCHIVE_SUFFIXES, is_archive
+
+console = Console(highlight = False, record = True)
+
+# Characters that make an entry given to --batch a glob pattern.
+GLOB_CHARS = '*?['
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of running the reports over one course of a batch. The
+    `issues` hold the number of findings of each report, None for reports
+    that do not return any.
+    """
+    docdir: Path
+    name: str
+    load_seconds: float = 0.0
+    report_seconds: float = 0.0
+    issues: dict[str, int | None] = field(default_factory = dict)
+    error: str | None = None
+
+
+def expand_docdirs(entries: list[str]) -> list[Path]:
+    """
+    Return the course directories or archives given by `entries`, in order
+    and without duplicates. An entry can be a glob pattern, a file that lists
+    one course per line (blank lines and lines starting with `#` are
+    skipped) or the path of a course.
+    """
+    docdirs: list[Path] = []
+    for entry in entries:
+        if any(char in entry for char in GLOB_CHARS):
+            docdirs += [Path(path) for path in sorted(glob.glob(entry))]
+        elif Path(entry).is_file() and not is_archive(Path(entry)):
+            docdirs += [
+                Path(line.strip())
+                    for line in Path(entry).read_text(encoding = 'utf-8').splitlines()
+                    if line.strip() and not line.strip().startswith('#')
+            ]
+        else:
+            docdirs.append(Path(entry))
+    return list(dict.fromkeys(docdirs))
+
+
+def output_names(docdirs: list[Path]) -> list[str]:
+    """
+    Return a name for each course that its outputs can be written under. The
+    name is that of the directory or archive, without the archive's suffix,
+    with a number appended where names would clash.
+    """
+    names: list[str] = []
+    seen: dict[str, int] = {}
+    for docdir in docdirs:
+        name = docdir.name
+        for suffix in ARCHIVE_SUFFIXES:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(f"{name}-{count + 1}" if count else name)
+    return names
+
+
+def print_summary(results: list[BatchResult], reports: list[str], output: Path | None = None):
+    """
+    Print a table with one row per course and, if `output` is given, write
+    it to that file as HTML.
+    """
+    table = Table(title = 'doclint batch summary')
+    table.add_column('course')
+    for report in reports:
+        table.add_column(report, justify = 'right')
+    table.add_column('load (s)', justify = 'right')
+    table.add_column('reports (s)', justify = 'right')
+    table.add_column('status')
+    for result in results:
+        table.add_row(
+            result.name,
+            *[format_issues(result.issues.get(report)) for report in reports],
+            f"{result.load_seconds:.2f}",
+            f"{result.report_seconds:.2f}",
+            f"[red]{result.error}[/red]" if result.error else "[green]ok[/green]"
+        )
+    console.print(table)
+    if output:
+        html = console.export_html()
+        with open(output, 'w', encoding = 'utf8') as fd:
+            fd.write(html)
+
+
+def format_issues(issues: int | None) -> str:
+    """
+    Format the number of issues a report found for the summary table.
+    """
+    return '-' if issues is None else str(issues)
@@ -0,0 +1,143 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+"""
+A persistent on-disk cache for data extracted from source files, so that
+files that have not changed since the last run do not need to be parsed again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+from pathlib import Path
+from typing import Any
+
+# Bump this whenever the format of cached data changes so old entries are
+# no longer used.
+CACHE_VERSION = 3
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class ParseCache:
+    """
+    Stores whatever was extracted from a source file under a key made from
+    the `kind` of data, the file's path and its modification time and size.
+    A changed file therefore gets a new key and the old entry is eventually
+    removed by `evict()`, which deletes the least recently used entries once
+    the cache grows beyond `max_bytes`.
+
+    Entries are written atomically, so the cache can be used from several
+    threads or processes at the same time.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents = True, exist_ok = True)
+
+    def key(self, path: Path, kind: str) -> str | None:
+        """
+        Return the key for the data of the given `kind` extracted from the
+        file at `path`, None if the file cannot be found. The `path` can be
+        a `Path` or anything else that has `stat()` and `absolute()` methods,
+        such as an `ArchivePath`.
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        ident = f"{CACHE_VERSION}:{kind}:{path.absolute()}:{stat.st_mtime_ns}:{stat.st_size}"
+        return hashlib.sha1(ident.encode('utf-8')).hexdigest()
+
+    def entry(self, key: str) -> Path:
+        """
+        Return the path of the file that holds the entry for `key`.
+        """
+        return self.directory.joinpath(key[:2], key[2:] + '.pickle')
+
+    def get(self, path: Path, kind: str) -> Any | None:
+        """
+        Return the cached data for the file at `path`, None if there is none
+        or it cannot be read.
+        """
+        key = self.key(path, kind)
+        if key is None:
+            return None
+        entry = self.entry(key)
+        try:
+            with open(entry, 'rb') as fd:
+                data = pickle.load(fd)
+            os.utime(entry) # mark as recently used for eviction
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        return data
+
+    def put(self, path: Path, kind: str, data: Any) -> None:
+        """
+        Store the `data` extracted from the file at `path`.
+        """
+        key = self.key(path, kind)
+        if key is None:
+            return
+        entry = self.entry(key)
+        entry.parent.mkdir(exist_ok = True)
+        (fd, tmpname) = tempfile.mkstemp(dir = entry.parent, suffix = '.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                pickle.dump(data, tmp, protocol = pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpname, entry)
+        except OSError:
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+
+    def evict(self) -> None:
+        """
+        Delete the least recently used entries until the cache is no larger
+        than `max_bytes`.
+        """
+        entries = []
+        total = 0
+        for entry in self.directory.glob('*/*.pickle'):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for (_, size, entry) in entries:
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
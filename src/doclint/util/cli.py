@@ -37,11 +37,31 @@ parser.add_argument('report', type = str, nargs = '*',
         help = 'the report to run'
             +' - run doclint -h to see supported reports')
 parser.add_argument('-d', '--docdir', type = str,
-        help = 'the directory that contains the documentation')
+        help = 'the directory or archive that contains the documentation')
+parser.add_argument('--batch', type = str, action = 'append',
+        help = 'check many courses in one run: a glob pattern, a file listing one'
+            +' course per line or a course; can be given more than once')
 parser.add_argument('-t', '--type', type=str,
                     help='the type of input data')
 parser.add_argument('-o', '--output', type=str,
                     help='html file to output results to')
+parser.add_argument('-j', '--jobs', type=int, default=1,
+                    help='number of threads used to read the content and of'
+                        +' processes used to run the checks report')
+parser.add_argument('--lazy', action='store_true',
+                    help='only parse content when a report needs it')
+parser.add_argument('--engine', type=str, default='bs4', choices=['bs4', 'lxml'],
+                    help='the engine used to parse HTML content')
+parser.add_argument('--dedup', action='store_true',
+                    help='parse and check byte-identical HTML content only once')
+parser.add_argument('--cache', type=str,
+                    help='directory to cache parsed content in between runs')
+parser.add_argument('--cache-size', type=int, default=512,
+                    help='maximum size of the cache in megabytes')
+parser.add_argument('-v', '--verbose', action='store_true',
+                    help='also list what passed, for reports that support it')
+parser.add_argument('--stream', action='store_true',
+                    help='stream the content to the reports instead of loading it all first')
 parser.add_argument('--types', action='store_true',
                     help='lists the content types available')
 parser.add_argument('--reports', action='store_true',
@@ -0,0 +1,188 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Finding the dimensions and file size of images by reading only the first
+bytes of the file, where PNG, GIF, JPEG, WebP and SVG images keep their
+dimensions, without decoding the image. Results are cached by the path and
+modification time of the file, as the same image is often used many times.
+"""
+
+from __future__ import annotations
+
+import re
+import struct
+
+from dataclasses import dataclass
+from pathlib import Path
+
+# Bytes read from the start of a file, enough for the headers of all formats
+# except JPEG files with large metadata, for which up to `JPEG_HEAD` bytes
+# are read.
+HEAD = 4096
+JPEG_HEAD = 1024 * 1024
+
+# JPEG markers that start a frame and hold the dimensions.
+JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+SVG_ROOT = re.compile(rb'<svg\b[^>]*>', re.IGNORECASE | re.DOTALL)
+SVG_NUMBER = rb'(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)'
+SVG_LENGTH = rb'\s%s\s*=\s*["\']\s*(' + SVG_NUMBER + rb')\s*(?:px)?\s*["\']'
+SVG_VIEWBOX = re.compile(
+    rb'\sviewBox\s*=\s*["\']\s*-?' + SVG_NUMBER + rb'[\s,]+-?' + SVG_NUMBER
+        + rb'[\s,]+(' + SVG_NUMBER + rb')[\s,]+(' + SVG_NUMBER + rb')',
+    re.IGNORECASE
+)
+
+
+@dataclass(frozen = True)
+class ImageInfo:
+    """
+    The `width` and `height` of an image in pixels, None if they could not
+    be found, and the `size` of its file in bytes.
+    """
+    width: int | None
+    height: int | None
+    size: int
+
+
+# Results by path, modification time and size of the file.
+inspected: dict[tuple[str, int, int], ImageInfo] = {}
+
+
+def inspect_image(path) -> ImageInfo | None:
+    """
+    Return the dimensions and size of the image file at `path`, None if the
+    file cannot be read. The `path` can be a `Path` or an `ArchivePath`.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    info = inspected.get(key)
+    if info is None:
+        try:
+            head = read_head(path, HEAD)
+            if head.startswith(b'\xff\xd8') and jpeg_dimensions(head) is None:
+                head = read_head(path, JPEG_HEAD)
+        except OSError:
+            return None
+        dimensions = image_dimensions(head) or (None, None)
+        info = ImageInfo(dimensions[0], dimensions[1], stat.st_size)
+        inspected[key] = info
+    return info
+
+
+def read_head(path, size: int) -> bytes:
+    """
+    Return up to `size` bytes from the start of the file at `path`.
+    """
+    if hasattr(path, 'read_head'):
+        return path.read_head(size)
+    with open(path, 'rb') as fd:
+        return fd.read(size)
+
+
+def image_dimensions(head: bytes) -> tuple[int, int] | None:
+    """
+    Return the width and height of the image that starts with the bytes
+    `head`, None if the format is not known or the header is incomplete.
+    """
+    if head.startswith(b'\x89PNG\r\n\x1a\n') and len(head) >= 24:
+        return struct.unpack('>II', head[16:24])
+    if head[:6] in (b'GIF87a', b'GIF89a') and len(head) >= 10:
+        return struct.unpack('<HH', head[6:10])
+    if head.startswith(b'\xff\xd8'):
+        return jpeg_dimensions(head)
+    if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+        return webp_dimensions(head)
+    if b'<svg' in head[:HEAD].lower():
+        return svg_dimensions(head)
+    return None
+
+
+def jpeg_dimensions(head: bytes) -> tuple[int, int] | None:
+    """
+    Return the dimensions from the start-of-frame segment of a JPEG image.
+    """
+    position = 2
+    while position + 9 <= len(head):
+        if head[position] != 0xFF:
+            return None
+        marker = head[position + 1]
+        if marker == 0xFF: # padding
+            position += 1
+            continue
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7: # no length
+            position += 2
+            continue
+        (length,) = struct.unpack('>H', head[position + 2:position + 4])
+        if marker in JPEG_SOF:
+            (height, width) = struct.unpack('>HH', head[position + 5:position + 9])
+            return (width, height)
+        position += 2 + length
+    return None
+
+
+def webp_dimensions(head: bytes) -> tuple[int, int] | None:
+    """
+    Return the dimensions of a lossy, lossless or extended WebP image.
+    """
+    chunk = head[12:16]
+    if chunk == b'VP8 ' and len(head) >= 30:
+        (width, height) = struct.unpack('<HH', head[26:30])
+        return (width & 0x3FFF, height & 0x3FFF)
+    if chunk == b'VP8L' and len(head) >= 25:
+        bits = int.from_bytes(head[21:25], 'little')
+        return ((bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+    if chunk == b'VP8X' and len(head) >= 30:
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+        return (width, height)
+    return None
+
+
+def svg_dimensions(head: bytes) -> tuple[int, int] | None:
+    """
+    Return the dimensions of an SVG image given in pixels by the `width`
+    and `height` of its root element, or else by its `viewBox`, None if
+    neither is given or they are not valid numbers.
+    """
+    root = SVG_ROOT.search(head)
+    if root is None:
+        return None
+    element = root.group(0)
+    width = re.search(SVG_LENGTH.replace(b'%s', b'width'), element, re.IGNORECASE)
+    height = re.search(SVG_LENGTH.replace(b'%s', b'height'), element, re.IGNORECASE)
+    try:
+        if width is not None and height is not None:
+            return (round(float(width.group(1))), round(float(height.group(1))))
+        viewbox = SVG_VIEWBOX.search(element)
+        if viewbox is not None:
+            return (round(float(viewbox.group(1))), round(float(viewbox.group(2))))
+    except (ValueError, OverflowError):
+        return None
+    return None
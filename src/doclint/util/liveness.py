@@ -0,0 +1,270 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Checking whether the targets of external links are alive. Each distinct URL
+is requested once, by a pool of threads sharing urllib3 connection pools,
+with a limit on the number of concurrent requests to any one host. A HEAD
+request is tried first and a GET request if the server does not support
+HEAD. Results can be kept in a `LinkCache` so that URLs checked recently are
+not requested again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import urlsplit
+
+import urllib3
+
+# Seconds to wait for a connection and for a response.
+TIMEOUT = 10.0
+
+# Number of requests in flight at the same time, in total and per host.
+WORKERS = 16
+PER_HOST = 4
+
+# Results in the cache are used for this many seconds, those without an
+# HTTP status, such as timeouts, for a shorter time as they may be transient.
+CACHE_TTL = 24 * 60 * 60
+ERROR_TTL = 10 * 60
+
+# How often to try again after connection and read errors and how many
+# redirects to follow.
+RETRIES = 2
+REDIRECTS = 5
+
+# Status codes in response to HEAD that mean the server may not support it.
+HEAD_UNSUPPORTED = frozenset([400, 403, 404, 405, 429, 500, 501, 503])
+
+USER_AGENT = 'doclint link checker'
+
+# Bodies of responses to GET up to this size are read and thrown away so that
+# the connection can be used again, larger ones are not read and the
+# connection is closed instead.
+DRAIN_MAX_BYTES = 64 * 1024
+
+
+@dataclass
+class LinkStatus:
+    """
+    The result of checking a URL: the HTTP `status` of the response, if
+    there was one, or else the `error` that occurred, and when it was
+    `checked`, in seconds since the epoch.
+    """
+    url: str
+    status: int | None
+    error: str | None
+    checked: float
+
+    @property
+    def alive(self) -> bool:
+        return self.status is not None and self.status < 400
+
+    def describe(self) -> str:
+        """
+        Return the status code or error, for reports.
+        """
+        return str(self.status) if self.status is not None else str(self.error)
+
+
+def is_external(url: str | None) -> bool:
+    """
+    Returns True if `url` is an absolute http or https URL.
+    """
+    if not url:
+        return False
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    return parts.scheme in ('http', 'https') and bool(parts.netloc)
+
+
+class LinkCache:
+    """
+    Results of link checks kept in a JSON file between runs. Results older
+    than `ttl` seconds, or `error_ttl` seconds for results without an HTTP
+    status, are stale and not returned by `get()`.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl: float = CACHE_TTL,
+        error_ttl: float = ERROR_TTL
+        ) -> None:
+        self.file = Path(directory).joinpath('links.json')
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.lock = threading.Lock()
+        self.entries: dict[str, LinkStatus] = {}
+        try:
+            with open(self.file, 'r', encoding = 'utf-8') as fd:
+                for entry in json.load(fd):
+                    self.entries[entry['url']] = LinkStatus(**entry)
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+
+    def get(self, url: str) -> LinkStatus | None:
+        """
+        Return the result for `url` if it is not stale.
+        """
+        with self.lock:
+            status = self.entries.get(url)
+        if status is None or self.is_stale(status, time.time()):
+            return None
+        return status
+
+    def is_stale(self, status: LinkStatus, now: float) -> bool:
+        """
+        Returns True if the result `status` is too old to be used at `now`.
+        """
+        ttl = self.ttl if status.status is not None else self.error_ttl
+        return now - status.checked > ttl
+
+    def put(self, status: LinkStatus) -> None:
+        with self.lock:
+            self.entries[status.url] = status
+
+    def save(self) -> None:
+        """
+        Write the results to the cache file, dropping stale ones.
+        """
+        now = time.time()
+        with self.lock:
+            entries = [
+                asdict(status) for status in self.entries.values()
+                    if not self.is_stale(status, now)
+            ]
+        self.file.parent.mkdir(parents = True, exist_ok = True)
+        (fd, tmpname) = tempfile.mkstemp(dir = self.file.parent, suffix = '.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding = 'utf-8') as tmp:
+                json.dump(entries, tmp)
+            os.replace(tmpname, self.file)
+        except OSError:
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+
+
+class LinkChecker:
+    """
+    Checks URLs concurrently with `workers` threads, at most `per_host` of
+    them requesting from the same host at any time.
+    """
+
+    def __init__(
+        self,
+        cache: LinkCache | None = None,
+        timeout: float = TIMEOUT,
+        workers: int = WORKERS,
+        per_host: int = PER_HOST
+        ) -> None:
+        self.cache = cache
+        self.workers = workers
+        self.per_host = per_host
+        self.http = urllib3.PoolManager(
+            num_pools = workers,
+            maxsize = per_host,
+            timeout = urllib3.Timeout(connect = timeout, read = timeout),
+            retries = urllib3.Retry(
+                total = None,
+                connect = RETRIES,
+                read = RETRIES,
+                redirect = REDIRECTS,
+                status = 0,
+                raise_on_status = False
+            ),
+            headers = {'User-Agent': USER_AGENT}
+        )
+        self.hosts: dict[str, threading.BoundedSemaphore] = {}
+        self.hosts_lock = threading.Lock()
+
+    def check(self, urls: Iterable[str]) -> dict[str, LinkStatus]:
+        """
+        Check each distinct URL and return the results by URL. Results that
+        are in the cache and not stale are used instead of checking again.
+        """
+        results: dict[str, LinkStatus] = {}
+        missing = []
+        for url in dict.fromkeys(urls):
+            cached = self.cache.get(url) if self.cache is not None else None
+            if cached is not None:
+                results[url] = cached
+            else:
+                missing.append(url)
+        if missing:
+            with ThreadPoolExecutor(max_workers = self.workers) as executor:
+                for status in executor.map(self.check_url, missing):
+                    results[status.url] = status
+                    if self.cache is not None:
+                        self.cache.put(status)
+        return results
+
+    def check_url(self, url: str) -> LinkStatus:
+        """
+        Request `url` with HEAD and, if that fails, GET. Only the headers of
+        the response to GET are needed. Its body is drained if it is small,
+        so the connection goes back to the pool, see `DRAIN_MAX_BYTES`.
+        """
+        with self.host_limit(url):
+            try:
+                response = self.http.request('HEAD', url)
+                status = response.status
+                if status in HEAD_UNSUPPORTED:
+                    response = self.http.request('GET', url, preload_content = False)
+                    status = response.status
+                    remaining = response.length_remaining
+                    if remaining is not None and remaining <= DRAIN_MAX_BYTES:
+                        response.drain_conn()
+                    else:
+                        response.close()
+                    response.release_conn()
+                return LinkStatus(url, status, None, time.time())
+            except urllib3.exceptions.HTTPError as error:
+                return LinkStatus(url, None, type(error).__name__, time.time())
+
+    def host_limit(self, url: str) -> threading.BoundedSemaphore:
+        """
+        Return the semaphore that limits concurrent requests to the host of
+        `url`.
+        """
+        host = urlsplit(url).netloc.lower()
+        with self.hosts_lock:
+            semaphore = self.hosts.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host)
+                self.hosts[host] = semaphore
+        return semaphore
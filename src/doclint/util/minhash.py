@@ -0,0 +1,158 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Finding near-duplicate texts with MinHash signatures and locality-sensitive
+hashing (LSH). Each text is reduced to a set of shingles, overlapping runs of
+words, and a signature of the minimum hash value of its shingles under each
+of a number of hash functions. The fraction of positions in which two
+signatures agree estimates the Jaccard similarity of the shingle sets.
+Signatures are cut into bands and texts that agree in all rows of any band
+end up in the same bucket, so only texts that share a bucket are compared,
+rather than every pair of texts. Texts with the same signature are grouped
+first and only one of each group is put into the buckets, so that many
+copies of the same text do not make for many pairs.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+
+from itertools import combinations
+
+import numpy as np
+
+# The prime the hash functions work modulo, 2^31 - 1, small enough that the
+# products in `signature()` fit into 64 bits.
+PRIME = (1 << 31) - 1
+
+WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = 5) -> set[str]:
+    """
+    Return the runs of `size` consecutive words in `text`, ignoring case.
+    Texts with fewer words are a single shingle.
+    """
+    words = WORD.findall(text.lower())
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[start:start + size]) for start in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures with `permutations` hash functions of the
+    form `(a * x + b) mod PRIME`, with `a` and `b` drawn from a generator
+    seeded with `seed` so that signatures are the same in every run.
+    """
+
+    def __init__(self, permutations: int = 128, seed: int = 1) -> None:
+        generator = np.random.default_rng(seed)
+        self.a = generator.integers(1, PRIME, size = permutations, dtype = np.uint64)
+        self.b = generator.integers(0, PRIME, size = permutations, dtype = np.uint64)
+
+    def signature(self, shingles: set[str]) -> np.ndarray:
+        """
+        Return the signature of a set of shingles, all hash functions being
+        applied to all shingles in one array operation.
+        """
+        if not shingles:
+            return np.full(len(self.a), PRIME, dtype = np.uint64)
+        values = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) % PRIME for shingle in shingles),
+            dtype = np.uint64,
+            count = len(shingles)
+        )
+        hashes = (self.a[:, None] * values[None, :] + self.b[:, None]) % PRIME
+        return hashes.min(axis = 1)
+
+
+class LSHIndex:
+    """
+    An index of signatures cut into `bands` bands of `rows` rows each. Pairs
+    with a similarity of about `(1 / bands) ** (1 / rows)` or more are
+    likely to share a bucket in at least one band.
+
+    Signatures that are the same are kept in `groups`, by their bytes, and
+    only the first of each group, its representative, is put into the
+    buckets.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 8) -> None:
+        self.bands = bands
+        self.rows = rows
+        self.buckets: dict[tuple[int, bytes], list[int]] = {}
+        self.signatures: list[np.ndarray] = []
+        self.groups: dict[bytes, list[int]] = {}
+
+    def add(self, signature: np.ndarray) -> int:
+        """
+        Add a signature and return its index.
+        """
+        index = len(self.signatures)
+        self.signatures.append(signature)
+        group = self.groups.setdefault(signature.tobytes(), [])
+        group.append(index)
+        if len(group) == 1:
+            for band in range(self.bands):
+                rows = signature[band * self.rows:(band + 1) * self.rows]
+                self.buckets.setdefault((band, rows.tobytes()), []).append(index)
+        return index
+
+    def duplicates(self) -> list[list[int]]:
+        """
+        Return the groups of indexes with the same signature that have more
+        than one member, each group in the order the signatures were added.
+        """
+        return [group for group in self.groups.values() if len(group) > 1]
+
+    def candidates(self) -> set[tuple[int, int]]:
+        """
+        Return the pairs of representatives that share at least one bucket.
+        """
+        pairs: set[tuple[int, int]] = set()
+        for members in self.buckets.values():
+            if len(members) > 1:
+                pairs.update(combinations(members, 2))
+        return pairs
+
+    def similar(self, threshold: float) -> list[tuple[int, int, float]]:
+        """
+        Return the candidate pairs whose estimated similarity is at least
+        `threshold`, with that similarity, most similar first. Only pairs of
+        representatives are returned, see `duplicates()` for the others.
+        """
+        pairs = sorted(self.candidates())
+        if not pairs:
+            return []
+        signatures = np.stack(self.signatures)
+        (first, second) = np.array(pairs).T
+        similarity = (signatures[first] == signatures[second]).mean(axis = 1)
+        keep = np.flatnonzero(similarity >= threshold)
+        found = [(int(first[i]), int(second[i]), float(similarity[i])) for i in keep]
+        found.sort(key = lambda pair: (-pair[2], pair[0], pair[1]))
+        return found
@@ -0,0 +1,111 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+"""
+Parsing of XML and HTML files with lxml. Files are handed to lxml as raw
+bytes, or for files on disk as a filename so that libxml2 reads them itself
+without the GIL held, and the parsers are reused rather than created for
+every file.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from pathlib import Path
+
+from lxml import etree
+
+# lxml parsers can be reused but not by several threads at the same time,
+# so each thread gets its own.
+_parsers = threading.local()
+
+
+def xml_parser() -> etree.XMLParser:
+    """
+    Return the XML parser for the current thread. XML parsers detect the
+    encoding themselves from the byte order mark or XML declaration.
+    """
+    if not hasattr(_parsers, 'xml'):
+        _parsers.xml = etree.XMLParser()
+    return _parsers.xml
+
+
+def html_parser() -> etree.HTMLParser:
+    """
+    Return the HTML parser for the current thread. HTML files without a
+    declared encoding would be read as Latin-1 by libxml2, so UTF-8 is set
+    explicitly as both Open edX and MkDocs write UTF-8. Files that turn out
+    not to be UTF-8 are decoded in Python and parsed again as text, see
+    `parse_html()`.
+    """
+    if not hasattr(_parsers, 'html'):
+        _parsers.html = etree.HTMLParser(encoding = 'utf-8')
+    return _parsers.html
+
+
+def html_text_parser() -> etree.HTMLParser:
+    """
+    Return the parser for the current thread for HTML that has already been
+    decoded to a string.
+    """
+    if not hasattr(_parsers, 'html_text'):
+        _parsers.html_text = etree.HTMLParser()
+    return _parsers.html_text
+
+
+def parse_xml_file(file: Path):
+    """
+    Parse an XML file and return its root element.
+    """
+    return parse_file(file, xml_parser())
+
+
+def parse_html_file(file: Path):
+    """
+    Parse an HTML file and return its root element, None if it is empty.
+    """
+    return parse_file(file, html_parser())
+
+
+def parse_html(data: bytes | str):
+    """
+    Parse HTML from bytes, taken to be UTF-8, or from a string and return
+    the root element, None if it is empty.
+    """
+    if isinstance(data, str):
+        return etree.fromstring(data, html_text_parser())
+    return etree.fromstring(data, html_parser())
+
+
+def parse_file(file: Path, parser: etree.XMLParser):
+    """
+    Parse a file with the given `parser`. Files on disk are read by libxml2
+    directly, anything else that behaves like a path, such as an
+    `ArchivePath`, has its bytes read first.
+    """
+    if isinstance(file, Path):
+        return etree.parse(str(file), parser).getroot()
+    return etree.fromstring(file.read_bytes(), parser)
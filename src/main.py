@@ -39,13 +39,19 @@ The tool comes with a number of integrations. Supported at the moment are:
 # TODO: move some of this functionality into the doclint package.
 
 import importlib
+import inspect
 import sys
+import time
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
 import doclint.util.extensions as extensions
 import doclint.util.cli as cli
 
+from doclint.util.batch import BatchResult, expand_docdirs, output_names, print_summary
+from doclint.util.cache import ParseCache
+
 datatypes: dict = extensions.find_datatypes()
 heuristics: dict = extensions.find_heuristics()
 reports: dict = extensions.import_reports()
@@ -65,32 +71,192 @@ def main():
                 print_report_help(report) # help for a specific report
         else:
             cli.print_help() # general help
-    else:
-        data = read_data(args.type, Path(args.docdir))
+    elif args.batch:
+        results = run_batch(args)
+        if any(result.error for result in results):
+            sys.exit(1)
+    elif args.stream:
+        options = read_options(args)
         for report in args.report:
             output = Path(args.output).joinpath(report+".html") \
                 if args.output else None
-            run_report(report, data, output)
+            nodes = stream_data(args.type, Path(args.docdir), **options)
+            run_report_stream(report, nodes, output, verbose = args.verbose)
+        if options['cache'] is not None:
+            options['cache'].evict()
+    else:
+        options = read_options(args)
+        data = read_data(args.type, Path(args.docdir), jobs = args.jobs, **options)
+        try:
+            for report in args.report:
+                output = Path(args.output).joinpath(report+".html") \
+                    if args.output else None
+                run_report(report, data, output,
+                    jobs = args.jobs, cache = options['cache'], verbose = args.verbose)
+        finally:
+            data.close()
+        if options['cache'] is not None:
+            options['cache'].evict() # after the reports, which may add lazy content
+
+
+def run_batch(args) -> list[BatchResult]:
+    """
+    Run the reports over each course given with `--batch`, in one process so
+    that the extensions, heuristics and reports are only loaded once. The
+    content of all courses is read by one shared pool of `--jobs` threads and
+    the next course is loaded while the reports run over the current one.
+
+    With `--output`, the results for each course are written to a directory
+    of their own, named after the course, and the summary to `summary.html`.
+    A course that cannot be read or reported on is recorded as failed and the
+    batch carries on with the next one.
+
+    Reports that take `jobs` may fork worker processes. Forking while other
+    threads are parsing can leave the workers with locks that are never
+    released, so before such a report runs with more than one job, loading
+    the next course is allowed to finish and the threads are idle.
+    """
+    docdirs = expand_docdirs(args.batch)
+    names = output_names(docdirs)
+    options = read_options(args)
+    results = []
+    with ThreadPoolExecutor(max_workers = max(args.jobs, 1)) as pool, \
+            ThreadPoolExecutor(max_workers = 1) as loader:
+
+        def load(docdir: Path):
+            start = time.perf_counter()
+            data = read_data(args.type, docdir, executor = pool, **options)
+            return (data, time.perf_counter() - start)
+
+        pending = loader.submit(load, docdirs[0]) if docdirs else None
+        for (index, (docdir, name)) in enumerate(zip(docdirs, names)):
+            current = pending
+            pending = loader.submit(load, docdirs[index + 1]) \
+                if index + 1 < len(docdirs) else None
+            result = BatchResult(docdir = docdir, name = name)
+            results.append(result)
+            data = None
+            try:
+                (data, result.load_seconds) = current.result()
+                start = time.perf_counter()
+                for report in args.report:
+                    if args.jobs > 1 and pending is not None and 'jobs' in report_parameters(report):
+                        wait([pending])
+                    output = None
+                    if args.output:
+                        outdir = Path(args.output).joinpath(name)
+                        outdir.mkdir(parents = True, exist_ok = True)
+                        output = outdir.joinpath(report+".html")
+                    findings = run_report(report, data, output,
+                        jobs = args.jobs, cache = options['cache'], verbose = args.verbose)
+                    clear_console(report)
+                    result.issues[report] = len(findings) if findings is not None else None
+                result.report_seconds = time.perf_counter() - start
+            except Exception as error:
+                result.error = f"{type(error).__name__}: {error}"
+            finally:
+                if data is not None:
+                    data.close()
+    if options['cache'] is not None:
+        options['cache'].evict()
+    summary = Path(args.output).joinpath('summary.html') if args.output else None
+    print_summary(results, args.report, summary)
+    return results
+
+
+def read_options(args) -> dict:
+    """
+    Return the options for reading content given on the command line, as
+    keyword arguments for the `load()` and `stream()` functions of datatypes.
+    """
+    cache = ParseCache(Path(args.cache), args.cache_size * 1024 * 1024) \
+        if args.cache else None
+    return {
+        'lazy': args.lazy,
+        'engine': args.engine,
+        'cache': cache,
+        'dedup': args.dedup,
+    }
+
+
+def read_data(datatype: str, docdir: Path, jobs: int = 1, **options):
+    """
+    Load data from the docdir provided using the given document loader,
+    reading content with `jobs` threads. Any further `options` are passed on
+    to the loader, see `read_options()`, as is an `executor` if given.
+    """
+    modname = 'doclint.datatypes.'+datatype
+    importlib.import_module(modname)
+    dataloader = sys.modules[modname]
+    return dataloader.load(docdir, jobs = jobs, **options)
 
 
-def read_data(datatype: str, docdir: Path):
+def run_report(report: str, data, output, **settings):
     """
-    Load data from the docdir provided using the given document loader
+    Load the report module and run the report. Of the `settings`, such as the
+    number of `jobs` or the `cache`, the report is given those its `report()`
+    function takes. Returns what the report returns, for most reports the
+    `Findings` of the heuristics it applied.
+    """
+    modname = 'doclint.reports.'+report
+    importlib.import_module(modname)
+    reporter = sys.modules[modname]
+    parameters = report_parameters(report)
+    wanted = {name: value for (name, value) in settings.items() if name in parameters}
+    return reporter.report(data, output, **wanted)
+
+
+def clear_console(report: str):
+    """
+    Drop what a report has printed to its console. Reports record their
+    output so that it can be written as HTML, which only clears the record
+    when there is an output file, so in a batch it would otherwise keep
+    growing from course to course.
+    """
+    console = getattr(sys.modules['doclint.reports.'+report], 'console', None)
+    if console is not None and console.record:
+        console.export_text(clear = True)
+
+
+def report_parameters(report: str):
+    """
+    Return the names of the parameters that the `report()` function of a
+    report takes.
+    """
+    modname = 'doclint.reports.'+report
+    importlib.import_module(modname)
+    return inspect.signature(sys.modules[modname].report).parameters
+
+
+def stream_data(datatype: str, docdir: Path, **options):
+    """
+    Return an iterator over the navigation nodes in the docdir provided, using
+    the `stream()` function of the given document loader. The `options` are
+    passed on to it, see `read_options()`.
     """
     modname = 'doclint.datatypes.'+datatype
     importlib.import_module(modname)
     dataloader = sys.modules[modname]
-    return dataloader.load(docdir)
+    if not hasattr(dataloader, 'stream'):
+        print(f"error: datatype {datatype} does not support streaming.")
+        sys.exit(1)
+    return dataloader.stream(docdir, **options)
 
 
-def run_report(report: str, data, output):
+def run_report_stream(report: str, nodes, output, **settings):
     """
-    Load the report module and run the report.
+    Load the report module and run the report over streamed navigation nodes.
+    The `settings` are passed on as for `run_report()`.
     """
     modname = 'doclint.reports.'+report
     importlib.import_module(modname)
     reporter = sys.modules[modname]
-    reporter.report(data, output)
+    if not hasattr(reporter, 'report_stream'):
+        print(f"error: report {report} does not support streaming.")
+        sys.exit(1)
+    parameters = inspect.signature(reporter.report_stream).parameters
+    wanted = {name: value for (name, value) in settings.items() if name in parameters}
+    reporter.report_stream(nodes, output, **wanted)
 
 
 def print_report_help(report: str):
@@ -0,0 +1,77 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+
+import pytest
+
+CHAPTERS = 2
+SEQUENTIALS = 2
+VERTICALS = 3
+
+PAGE = (
+    '<h2>Unit {name}</h2>'
+    '<p>Click <a href="https://www.google.com/search?q={name}">here</a> or see'
+    ' <a href="/jump_to_id/{name}">this unit</a> and <a href="/jump_to_id/nope">'
+    'a missing one</a>.<a name="{name}"></a></p>'
+    '<img src="/static/{name}.png">'
+)
+
+
+@pytest.fixture
+def course_dir(tmp_path):
+    """
+    A tiny Open edX course export with a few chapters, sequentials and
+    verticals, each vertical holding one HTML component with links and an
+    image that some of the heuristics flag.
+    """
+    root = tmp_path.joinpath('course')
+    for kind in ('course', 'chapter', 'sequential', 'vertical', 'html', 'static'):
+        root.joinpath(kind).mkdir(parents = True)
+    root.joinpath('course.xml').write_text('<course url_name="c" org="ORG" course="TST"/>')
+    chapters = []
+    for c in range(CHAPTERS):
+        sequentials = []
+        for s in range(SEQUENTIALS):
+            verticals = []
+            for v in range(VERTICALS):
+                name = f"v{c}_{s}_{v}"
+                verticals.append(f'<vertical url_name="{name}"/>')
+                root.joinpath('vertical', name + '.xml').write_text(
+                    f'<vertical display_name="Unit {name}"><html url_name="h{name}"/></vertical>'
+                )
+                root.joinpath('html', f"h{name}.xml").write_text(
+                    f'<html filename="h{name}" display_name="{name}"/>'
+                )
+                root.joinpath('html', f"h{name}.html").write_text(PAGE.format(name = name))
+            sequentials.append(f'<sequential url_name="s{c}_{s}"/>')
+            root.joinpath('sequential', f"s{c}_{s}.xml").write_text(
+                f'<sequential display_name="Sequential {c}.{s}">{"".join(verticals)}</sequential>'
+            )
+        chapters.append(f'<chapter url_name="ch{c}"/>')
+        root.joinpath('chapter', f"ch{c}.xml").write_text(
+            f'<chapter display_name="Chapter {c}">{"".join(sequentials)}</chapter>'
+        )
+    root.joinpath('course', 'c.xml').write_text(f'<course>{"".join(chapters)}</course>')
+    return root
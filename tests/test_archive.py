@@ -0,0 +1,68 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+
+import io
+import tarfile
+
+from doclint.util.archive import CourseArchive
+
+
+def make_tar(path, mode):
+    with tarfile.open(path, mode) as tar:
+        data = b'<course url_name="c"/>'
+        info = tarfile.TarInfo('course/course.xml')
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+
+
+def test_plain_tar_is_read_in_place(tmp_path):
+    path = tmp_path / 'course.tar'
+    make_tar(path, 'w')
+    with CourseArchive(path) as archive:
+        assert archive.data.name == str(path.absolute())
+        assert archive.fd is not None
+        assert archive.root('course.xml').joinpath('course.xml').read_bytes() == b'<course url_name="c"/>'
+    assert archive.data.closed
+
+
+def test_compressed_tar_is_decompressed(tmp_path):
+    path = tmp_path / 'course.tar.gz'
+    make_tar(path, 'w:gz')
+    with CourseArchive(path) as archive:
+        assert archive.fd is None
+        assert archive.root('course.xml').joinpath('course.xml').read_bytes() == b'<course url_name="c"/>'
+    assert archive.data.closed
+
+
+def test_large_archive_is_read_from_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr('doclint.util.archive.SPOOL_MAX_BYTES', 16)
+    path = tmp_path / 'course.tar.gz'
+    make_tar(path, 'w:gz')
+    with CourseArchive(path) as archive:
+        assert archive.fd is not None
+        archive.data.seek(0)
+        assert archive.root('course.xml').joinpath('course.xml').read_bytes() == b'<course url_name="c"/>'
+        assert archive.data.tell() == 0
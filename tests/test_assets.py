@@ -0,0 +1,56 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+from doclint.datatypes.material import SiteAssets
+from doclint.datatypes.openedx import StaticAssets
+from doclint.util.imageinfo import svg_dimensions
+
+
+def test_static_assets_stay_in_static(tmp_path):
+    static = tmp_path.joinpath('course', 'static')
+    static.mkdir(parents = True)
+    static.joinpath('pic.png').write_bytes(b'')
+    tmp_path.joinpath('secret').write_bytes(b'')
+    assets = StaticAssets(static)
+
+    assert assets.resolve('/static/pic.png') == static.joinpath('pic.png')
+    assert assets.resolve('/static/../../secret') is None
+    assert assets.resolve('/static/%2e%2e/%2e%2e/secret') is None
+
+
+def test_site_assets_stay_in_site(tmp_path):
+    site = tmp_path.joinpath('site')
+    site.joinpath('page').mkdir(parents = True)
+    tmp_path.joinpath('secret').write_bytes(b'')
+    assets = SiteAssets(site, site.joinpath('page'))
+
+    assert assets.resolve('../../secret') is None
+    assert assets.resolve('/../secret') is None
+
+
+def test_malformed_svg_has_no_dimensions():
+    assert svg_dimensions(b'<svg width="1.2.3" height="4">') is None
+    assert svg_dimensions(b'<svg width="." height="4">') is None
+    assert svg_dimensions(b'<svg width="10px" height="4">') == (10, 4)
@@ -0,0 +1,53 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+from doclint.datatypes.material import CONTENT_REGION, SiteAssets
+from doclint.structure.content import ReadOptions
+
+PAGE = b'<html><body><article><img src="img/x.png" alt="x"></article></body></html>'
+
+
+def test_shared_content_resolves_images_per_page(tmp_path):
+    for name in ('a', 'b'):
+        tmp_path.joinpath(name).mkdir()
+        tmp_path.joinpath(name, 'index.html').write_bytes(PAGE)
+    tmp_path.joinpath('a', 'img').mkdir()
+    tmp_path.joinpath('a', 'img', 'x.png').write_bytes(b'')
+
+    options = ReadOptions(shared = {})
+    pages = [
+        options.read_html(
+            tmp_path.joinpath(name, 'index.html'),
+            None,
+            region = CONTENT_REGION,
+            assets = SiteAssets(tmp_path, tmp_path.joinpath(name))
+        )
+        for name in ('a', 'b')
+    ]
+
+    assert pages[0].extracted is pages[1].extracted
+    assert pages[0].images()[0].file == tmp_path.joinpath('a', 'img', 'x.png')
+    assert pages[1].images()[0].file is None
+    assert pages[0].extracted[1][0].file is None
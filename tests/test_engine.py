@@ -0,0 +1,48 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+
+from doclint.datatypes import openedx
+from doclint.heuristics.engine import Engine, collect, work_units
+
+
+def test_parallel_run_matches_serial(course_dir):
+    course = openedx.load(course_dir)
+    engine = Engine()
+    serial = collect(engine.run(course))
+    parallel = engine.run_parallel(course, jobs = 3)
+    assert len(serial) > 0
+    assert list(parallel) == list(serial)
+    assert parallel.descriptions == serial.descriptions
+
+
+def test_work_units_cover_the_tree_in_order(course_dir):
+    course = openedx.load(course_dir)
+    units = work_units(course, 6)
+    assert len(units) >= 6
+    covered = []
+    for (node, whole) in units:
+        covered.extend(Engine().run(node) if whole else Engine().check_node(node))
+    assert [check.node for check in covered] == [check.node for check in Engine().run(course)]
@@ -0,0 +1,57 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+import pytest
+
+from doclint.structure.content import HTML_ENGINES, ReadOptions
+
+DOCUMENTS = {
+    'utf-8': '<p>café <a href="x">là</a></p><img src="i.png" alt="é">'.encode('utf-8'),
+    'declared charset': b'<meta charset="iso-8859-1"><p>caf\xe9</p>',
+    'not utf-8': b'<p>caf\xe9 <a href="x">l\xe9</a></p>',
+    'blocks': b'<h1>Title</h1><ul><li>one</li><li>two <b>bold</b></li></ul><script>x</script>',
+}
+
+
+@pytest.mark.parametrize('name', DOCUMENTS)
+def test_engines_extract_the_same(tmp_path, name):
+    source = tmp_path.joinpath('page.html')
+    source.write_bytes(DOCUMENTS[name])
+    extracted = [
+        ReadOptions(engine = engine).read_html(source, None).extracted
+            for engine in HTML_ENGINES
+    ]
+    assert extracted[0] == extracted[1]
+
+
+@pytest.mark.parametrize('name', DOCUMENTS)
+def test_engines_give_the_same_soup(tmp_path, name):
+    source = tmp_path.joinpath('page.html')
+    source.write_bytes(DOCUMENTS[name])
+    soups = [
+        ReadOptions(engine = engine).read_html(source, None).soup()
+            for engine in HTML_ENGINES
+    ]
+    assert str(soups[0]) == str(soups[1])
@@ -0,0 +1,78 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+
+import io
+
+from rich.console import Console
+
+from doclint.structure.findings import Finding, Findings, Severity, print_findings
+
+
+def sample() -> Findings:
+    findings = Findings()
+    findings.add('dl-a', '/c/one', 'x', Severity.WARNING, 'Check a.')
+    findings.add('dl-b', '/c/one', 'y', Severity.ERROR, 'Check b.')
+    findings.add('dl-a', '/c/two', 'z', Severity.INFO)
+    return findings
+
+
+def test_rows_read_back_as_added():
+    findings = sample()
+    assert len(findings) == 3
+    assert findings[1] == Finding('dl-b', '/c/one', 'y', Severity.ERROR)
+    assert findings.paths == ['/c/one', '/c/two']
+    assert findings.descriptions == {'dl-a': 'Check a.', 'dl-b': 'Check b.'}
+    assert findings.column('location') == ['x', 'y', 'z']
+    assert findings.count_by('heuristic') == {'dl-a': 2, 'dl-b': 1}
+
+
+def test_filter_sort_and_extend():
+    findings = sample()
+    assert findings.filter('dl-a').column('location') == ['x', 'z']
+    assert findings.filter('dl-missing').column('location') == []
+    assert findings.filter(min_severity = Severity.WARNING).column('location') == ['x', 'y']
+    assert findings.sorted('severity').column('location') == ['z', 'x', 'y']
+
+    merged = Findings()
+    merged.extend(findings)
+    merged.extend(findings)
+    assert list(merged) == list(findings) * 2
+    assert merged.descriptions == findings.descriptions
+
+
+def test_print_findings_groups_by_path():
+    console = Console(file = io.StringIO(), record = True, width = 200)
+    print_findings(sample(), console)
+    assert console.export_text().splitlines() == [
+        '/c/one',
+        '❌ x',
+        '   dl-a: Check a.',
+        '❌ y',
+        '   dl-b: Check b.',
+        '/c/two',
+        '❌ z',
+        '   dl-a: Check a.',
+    ]
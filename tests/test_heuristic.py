@@ -0,0 +1,56 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+
+from doclint.heuristics.heuristic import CacheInfo, ResultCache, item_key
+from doclint.heuristics.links import CheckLinkText
+from doclint.structure.content import Link
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(maxsize = 2)
+    cache.put('a', True)
+    cache.put('b', False)
+    assert cache.get('a') is True # 'b' is now the least recently used
+    cache.put('c', True)
+    assert cache.get('b') is None
+    assert cache.get('a') is True
+    assert cache.get('c') is True
+    assert cache.info() == CacheInfo(hits = 3, misses = 1, size = 2, maxsize = 2)
+
+    cache.clear()
+    assert cache.info() == CacheInfo(hits = 0, misses = 0, size = 0, maxsize = 2)
+
+
+def test_results_are_cached_by_value(monkeypatch):
+    cache = ResultCache()
+    monkeypatch.setattr('doclint.heuristics.heuristic.results', cache)
+    links = [Link(text = 'here', url = 'a', attrs = {}), Link(text = 'here', url = 'a', attrs = {'id': 'x'})]
+    assert item_key(links[0]) == item_key(links[1])
+
+    assert CheckLinkText.cached_passes_batch(links) == [False, False]
+    assert cache.info().misses == 2
+    assert CheckLinkText.cached_passes(links[1]) is False
+    assert cache.info().hits == 1
@@ -0,0 +1,41 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+
+from doclint.heuristics.links import CheckLinkText, CheckUrl, CheckUrlAlive, CheckUrlNoSearch
+from doclint.structure.content import Link
+
+ANCHOR = Link(text = 'x', url = None, attrs = {'name': 'x'})
+SEARCH = Link(text = 'x', url = 'https://www.google.com/search?q=x', attrs = {})
+
+
+def test_anchors_without_url_pass():
+    for heuristic in (CheckLinkText, CheckUrl, CheckUrlNoSearch, CheckUrlAlive):
+        assert heuristic.passes(ANCHOR)
+        assert heuristic.passes_batch([ANCHOR, ANCHOR]) == [True, True]
+
+
+def test_search_links_fail():
+    assert CheckUrlNoSearch.passes_batch([ANCHOR, SEARCH]) == [True, False]
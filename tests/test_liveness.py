@@ -0,0 +1,114 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from doclint.util.liveness import LinkCache, LinkChecker, LinkStatus
+
+
+class NoHeadHandler(BaseHTTPRequestHandler):
+    """
+    Answers HEAD with 405 and GET with a short page, or 404 for `/missing`,
+    keeping connections open. `/redirect<n>` redirects `n` times before
+    getting to a page.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def redirect(self) -> bool:
+        if not self.path.startswith('/redirect'):
+            return False
+        count = int(self.path[len('/redirect'):])
+        self.send_response(301)
+        self.send_header('Location', f'/redirect{count - 1}' if count > 1 else '/page')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        return True
+
+    def do_HEAD(self):
+        if self.redirect():
+            return
+        self.send_response(405)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        if self.redirect():
+            return
+        body = b'<html>' + b'x' * 1000 + b'</html>'
+        self.send_response(404 if self.path == '/missing' else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    NoHeadHandler.connections = 0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), NoHeadHandler)
+    thread = threading.Thread(target = httpd.serve_forever, daemon = True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_get_fallback_reuses_connections(server):
+    checker = LinkChecker(workers = 1, per_host = 1)
+    urls = [f'{server}/page{number}' for number in range(5)] + [f'{server}/missing']
+    statuses = checker.check(urls)
+
+    assert [statuses[url].alive for url in urls] == [True] * 5 + [False]
+    assert NoHeadHandler.connections == 1
+
+
+def test_redirect_chains_are_followed(server):
+    checker = LinkChecker()
+    url = f'{server}/redirect4'
+
+    assert checker.check([url])[url].alive
+
+
+def test_errors_are_cached_briefly(tmp_path):
+    cache = LinkCache(tmp_path, ttl = 1000, error_ttl = 10)
+    checked = time.time() - 100
+    cache.put(LinkStatus('http://a.example/', 404, None, checked))
+    cache.put(LinkStatus('http://b.example/', None, 'ConnectTimeoutError', checked))
+
+    assert cache.get('http://a.example/') is not None
+    assert cache.get('http://b.example/') is None
@@ -0,0 +1,40 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+from doclint.util.minhash import LSHIndex, MinHasher, shingles
+
+TEXT = ' '.join(f'word{number}' for number in range(200))
+
+
+def test_copies_are_grouped_not_paired():
+    hasher = MinHasher()
+    index = LSHIndex()
+    for _ in range(300):
+        index.add(hasher.signature(shingles(TEXT)))
+    index.add(hasher.signature(shingles(TEXT + ' one more')))
+
+    assert index.duplicates() == [list(range(300))]
+    assert len(index.candidates()) == 1
+    assert [pair[:2] for pair in index.similar(0.8)] == [(0, 300)]
@@ -0,0 +1,122 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+
+from doclint.datatypes import openedx
+from doclint.structure.content import HTMLContent, ProblemContent
+from doclint.structure.navigation import NavTree, contents, walk
+
+
+def parent_chain(node):
+    """
+    The depth and path of a node worked out by walking up to the root.
+    """
+    names = []
+    while node is not None:
+        names.append(str(node.name))
+        node = node.parent
+    return (len(names) - 1, '/' + '/'.join(reversed(names)))
+
+
+def test_tree_matches_parent_chain(course_dir):
+    course = openedx.load(course_dir)
+    tree = course.tree
+    assert isinstance(tree, NavTree)
+    assert len(tree) == 1 + 2 + 2 * 2 + 2 * 2 * 3
+    for (position, node) in enumerate(tree.nodes):
+        assert node.tree is tree and node.position == position
+        assert (node.get_depth(), node.get_path()) == parent_chain(node)
+        assert tree.children(position) == list(node.children() if node.has_children() else [])
+        if position > 0:
+            assert tree.nodes[tree.parent[position]] is node.parent
+    assert [node.get_depth() for node in tree.nodes] == sorted(node.get_depth() for node in tree.nodes)
+
+
+def test_depth_and_path_without_tree(course_dir):
+    course = openedx.load(course_dir)
+    nodes = list(course.tree.nodes)
+    expected = [(node.get_depth(), node.get_path()) for node in nodes]
+    for node in nodes:
+        node.tree = None
+    assert [(node.get_depth(), node.get_path()) for node in nodes] == expected
+
+
+def recursive_walk(node, prune = None):
+    """
+    Reference for `walk()`: the nodes below `node` in document order.
+    """
+    if prune is not None and prune(node):
+        return []
+    nodes = [node]
+    for child in node.children() if node.has_children() else []:
+        nodes.extend(recursive_walk(child, prune))
+    return nodes
+
+
+def test_walk_matches_recursion(course_dir):
+    course = openedx.load(course_dir)
+    assert list(walk(course)) == recursive_walk(course)
+    assert list(walk(course, openedx.Vertical)) == [
+        node for node in recursive_walk(course) if isinstance(node, openedx.Vertical)
+    ]
+
+
+def test_walk_prunes_subtrees(course_dir):
+    course = openedx.load(course_dir)
+
+    def pruned(node):
+        return node.name == 'Sequential 0.1'
+
+    walked = list(walk(course, prune = pruned))
+    assert walked == recursive_walk(course, pruned)
+    assert len(walked) == len(course.tree) - 1 - 3
+    assert [node for (node, _) in contents(course, prune = pruned)] == [
+        node for node in walked if node.has_content()
+    ]
+
+
+def test_walk_calls_hooks_in_order(course_dir):
+    course = openedx.load(course_dir)
+    events = []
+    for node in walk(
+            course,
+            (openedx.Course, openedx.Chapter),
+            pre = lambda node: events.append(('pre', node.name)),
+            post = lambda node: events.append(('post', node.name))):
+        events.append(('node', node.name))
+    assert events == [
+        ('pre', 'TST'), ('node', 'TST'),
+        ('pre', 'Chapter 0'), ('node', 'Chapter 0'), ('post', 'Chapter 0'),
+        ('pre', 'Chapter 1'), ('node', 'Chapter 1'), ('post', 'Chapter 1'),
+        ('post', 'TST'),
+    ]
+
+
+def test_contents_filters_by_type(course_dir):
+    course = openedx.load(course_dir)
+    html = list(contents(course, HTMLContent))
+    assert len(html) == 2 * 2 * 3
+    assert all(content.parent is node for (node, content) in html)
+    assert list(contents(course, ProblemContent)) == []
@@ -0,0 +1,62 @@
+# =============================================================================
+# MIT License
+#
+# Copyright (c) 2023 Alexander Voss
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# =============================================================================
+
+
+
+import pytest
+
+from doclint.datatypes import openedx
+from doclint.structure.navigation import contents, walk
+from doclint.util.cache import ParseCache
+
+
+def outline(course):
+    """
+    The type, name and path of each node of a course in document order,
+    with the links found in the content of each.
+    """
+    return [
+        (type(node).__name__, node.name, node.get_path(),
+            [link.url for content in node.content() for link in content.links()]
+                if node.has_content() else [])
+        for node in walk(course)
+    ]
+
+
+def test_parallel_load_matches_serial(course_dir):
+    serial = openedx.load(course_dir)
+    parallel = openedx.load(course_dir, jobs = 4)
+    assert outline(parallel) == outline(serial)
+    assert len(outline(serial)) == 1 + 2 + 2 * 2 + 2 * 2 * 3
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_warm_cache_skips_parsing(course_dir, tmp_path, lazy):
+    cache = ParseCache(tmp_path.joinpath('cache'))
+    cold = openedx.load(course_dir, lazy = lazy, cache = cache)
+    expected = outline(cold)
+
+    warm = openedx.load(course_dir, lazy = lazy, cache = cache)
+    assert all(content.extracted is not None for (_, content) in contents(warm))
+    assert outline(warm) == expected